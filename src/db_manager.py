@@ -1,11 +1,36 @@
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
 import json
 import os
 import logging
+import queue
+import re
+import threading
+import weakref
 from datetime import datetime
 import kuzu
 from pydantic import BaseModel
 
+# orjson is considerably faster for record content; fall back to the stdlib if absent
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# pyarrow lets Kuzu hand back whole result sets at once; without it, results
+# are read a row at a time
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +38,317 @@ logging.basicConfig(
 )
 logger = logging.getLogger("db_manager")
 
+# Maximum number of known-missing URIs remembered by get_record_by_uri
+MISSING_CACHE_SIZE = 100_000
+
+# Maximum number of record contents remembered by get_record_by_uri
+RECORD_CACHE_SIZE = 10_000
+
+# Number of records mirrored per bulk write
+MIRROR_BATCH_SIZE = 500
+
+# Number of distinct createdAt strings whose parsed datetimes are kept; records
+# created in the same burst often share a timestamp
+TIMESTAMP_CACHE_SIZE = 4096
+
+# Number of rows iter_records converts from a query result at a time
+LIST_BATCH_SIZE = 1000
+
+# Bounds on the text passed to the FTS index: words past FTS_MAX_WORDS and
+# words longer than FTS_MAX_WORD_LENGTH characters are dropped
+FTS_MAX_WORDS = 64
+FTS_MAX_WORD_LENGTH = 64
+
+# Number of connections reserved for searches, so they don't queue behind writes
+READ_POOL_SIZE = 4
+
+# Databases open in this process, keyed by real path. Each kuzu.Database runs
+# its own worker threads and Kuzu allows only one per directory in a process,
+# so managers on the same path share one; it closes once none of them use it.
+_DATABASES: "weakref.WeakValueDictionary[str, _SharedDatabase]" = weakref.WeakValueDictionary()
+_DATABASES_LOCK = threading.Lock()
+
+# Type-specific node table for each record type, keyed by the last two NSID
+# segments of its collection (e.g. me.comind.blip.concept -> blip.concept)
+_COLLECTION_LABELS = {
+    'sphere.core': 'Sphere',
+    'blip.concept': 'BlipConcept',
+    'blip.emotion': 'BlipEmotion',
+    'blip.thought': 'BlipThought',
+}
+
+# Record fields copied onto each type-specific node, keyed by node label
+_NODE_FIELDS = {
+    'Sphere': ('title', 'text', 'description'),
+    'BlipConcept': ('text',),
+    'BlipEmotion': ('type', 'text'),
+    'BlipThought': ('type', 'context', 'text'),
+}
+
+# Upserts for the type-specific node tables, keyed by node label
+_NODE_QUERIES = {
+    'Sphere': """
+        MERGE (s:Sphere {uri: $uri})
+        SET s.title = $title,
+            s.text = $text,
+            s.description = $description,
+            s.createdAt = $createdAt
+    """,
+    'BlipConcept': """
+        MERGE (c:BlipConcept {uri: $uri})
+        SET c.text = $text,
+            c.createdAt = $createdAt
+    """,
+    'BlipEmotion': """
+        MERGE (e:BlipEmotion {uri: $uri})
+        SET e.type = $type,
+            e.text = $text,
+            e.createdAt = $createdAt
+    """,
+    'BlipThought': """
+        MERGE (t:BlipThought {uri: $uri})
+        SET t.type = $type,
+            t.context = $context,
+            t.text = $text,
+            t.createdAt = $createdAt
+    """,
+}
+
+# Bulk upserts for the type-specific node tables, keyed by node label
+_BULK_NODE_QUERIES = {
+    'Sphere': """
+        UNWIND $rows AS row
+        MERGE (s:Sphere {uri: row.uri})
+        SET s.title = row.title,
+            s.text = row.text,
+            s.description = row.description,
+            s.createdAt = row.createdAt
+    """,
+    'BlipConcept': """
+        UNWIND $rows AS row
+        MERGE (c:BlipConcept {uri: row.uri})
+        SET c.text = row.text,
+            c.createdAt = row.createdAt
+    """,
+    'BlipEmotion': """
+        UNWIND $rows AS row
+        MERGE (e:BlipEmotion {uri: row.uri})
+        SET e.type = row.type,
+            e.text = row.text,
+            e.createdAt = row.createdAt
+    """,
+    'BlipThought': """
+        UNWIND $rows AS row
+        MERGE (t:BlipThought {uri: row.uri})
+        SET t.type = row.type,
+            t.context = row.context,
+            t.text = row.text,
+            t.createdAt = row.createdAt
+    """,
+}
+
+_BULK_RECORD_QUERY = """
+    UNWIND $rows AS row
+    MERGE (r:Record {uri: row.uri})
+    SET r.cid = row.cid,
+        r.collection = row.collection,
+        r.rkey = row.rkey,
+        r.createdAt = row.createdAt,
+        r.recordType = row.recordType,
+        r.content = row.content,
+        r.content_lc = row.content_lc
+"""
+
+_BULK_COLLECTION_QUERY = """
+    UNWIND $names AS name
+    MERGE (c:Collection {name: name})
+"""
+
+_BULK_IN_COLLECTION_QUERY = """
+    UNWIND $rows AS row
+    MATCH (r:Record {uri: row.uri})
+    MATCH (c:Collection {name: row.collection})
+    MERGE (r)-[:IN_COLLECTION]->(c)
+"""
+
+_BULK_USER_QUERY = """
+    UNWIND $dids AS did
+    MERGE (u:User {did: did})
+"""
+
+_BULK_AUTHORED_QUERY = """
+    UNWIND $rows AS row
+    MATCH (u:User {did: row.did}), (r:Record {uri: row.uri})
+    MERGE (u)-[rel:AUTHORED]->(r)
+    SET rel.createdAt = row.createdAt
+"""
+
+_BULK_IN_SPHERE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (r:Record {uri: row.uri}), (s:Sphere {uri: row.sphere_uri})
+    MERGE (r)-[rel:IN_SPHERE]->(s)
+    SET rel.createdAt = row.createdAt
+"""
+
+_BULK_TARGET_QUERY = """
+    UNWIND $rows AS row
+    MATCH (r:Record {uri: row.uri}), (t:Record {uri: row.target_uri})
+    MERGE (r)-[rel:TARGET]->(t)
+    SET rel.createdAt = row.createdAt
+"""
+
+_BULK_LINKS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (from:Record {uri: row.from_uri}), (to:Record {uri: row.to_uri})
+    MERGE (from)-[rel:LINKS]->(to)
+    SET rel.relType = row.rel_type,
+        rel.strength = row.strength,
+        rel.note = row.note,
+        rel.createdAt = row.createdAt
+"""
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing Z for UTC."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def _parse_created_at(record: Dict) -> datetime:
+    """
+    Get a record's createdAt as a datetime for Kuzu's TIMESTAMP type.
+    
+    Falls back to the current time when the field is missing or unparseable.
+    """
+    created_at = record.get('createdAt')
+    if created_at is None:
+        return datetime.now()
+    if not isinstance(created_at, str):
+        return created_at
+    try:
+        return _parse_timestamp(created_at)
+    except ValueError as e:
+        logger.warning(f"Error parsing timestamp {created_at}: {e}. Using current time.")
+        return datetime.now()
+
+
+# Runs of letters and digits, the terms the FTS index matches on
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _fts_terms(text: str) -> str:
+    """Reduce search text to the words the FTS index can match, within FTS_MAX_WORDS."""
+    words = [word for word in _WORD.findall(text) if len(word) <= FTS_MAX_WORD_LENGTH]
+    return " ".join(words[:FTS_MAX_WORDS])
+
+
+def _fts_missing(error: Exception) -> bool:
+    """Whether an FTS search failed because the extension isn't loaded or the index doesn't exist."""
+    message = str(error).lower()
+    # e.g. "function QUERY_FTS_INDEX is not defined. This function exists in the FTS
+    # extension..." or "Table Record doesn't have an index with name content_index."
+    if "query_fts_index" in message:
+        return "not defined" in message or "does not exist" in message
+    return "content_index" in message
+
+
+def _collection_label(collection: str) -> Optional[str]:
+    """Get the type-specific node label for a collection, if it has one."""
+    return _COLLECTION_LABELS.get(".".join(collection.rsplit(".", 2)[-2:]))
+
+
+def _node_row(label: str, uri: str, record: Dict, created_at: datetime) -> Dict:
+    """Get the query parameters for a record's type-specific node."""
+    # Missing and null fields alike default to '', as Kuzu can't bind an UNWIND
+    # column that is NULL in every row
+    row = {field: record.get(field) or '' for field in _NODE_FIELDS[label]}
+    row['uri'] = uri
+    row['createdAt'] = created_at
+    return row
+
+
+class _SharedDatabase:
+    """A Database with the search connections and URI lookup caches its managers share."""
+    
+    def __init__(self, db_path: str, auto_checkpoint: bool):
+        self.db = kuzu.Database(db_path, auto_checkpoint=auto_checkpoint)
+        self.auto_checkpoint = auto_checkpoint
+        self.read_pool: queue.Queue = queue.Queue()
+        for _ in range(READ_POOL_SIZE):
+            self.read_pool.put(kuzu.Connection(self.db))
+        
+        # URIs known not to be in the database, and the content JSON of recently
+        # looked-up records, in insertion order (FIFO eviction). They are shared
+        # so that a write through any manager invalidates them for every manager.
+        self.missing: Dict[str, None] = {}
+        self.contents: Dict[str, str] = {}
+        # Bumped on every invalidation, so a lookup that raced a write isn't cached
+        self.generation = 0
+        self.cache_lock = threading.Lock()
+    
+    def remember_missing(self, uri: str, generation: int) -> None:
+        """Cache a lookup miss, unless the caches were invalidated since the lookup began."""
+        with self.cache_lock:
+            if generation == self.generation:
+                if len(self.missing) >= MISSING_CACHE_SIZE:
+                    del self.missing[next(iter(self.missing))]
+                self.missing[uri] = None
+    
+    def remember_content(self, uri: str, content: str, generation: int) -> None:
+        """Cache a record's content, unless the caches were invalidated since the lookup began."""
+        with self.cache_lock:
+            if generation == self.generation:
+                if len(self.contents) >= RECORD_CACHE_SIZE:
+                    del self.contents[next(iter(self.contents))]
+                self.contents[uri] = content
+    
+    def forget(self, uris: Optional[List[str]]) -> None:
+        """Invalidate the cached lookups of some URIs, or of every URI if None."""
+        with self.cache_lock:
+            self.generation += 1
+            if uris is None:
+                self.missing.clear()
+                self.contents.clear()
+                return
+            for uri in uris:
+                self.missing.pop(uri, None)
+                self.contents.pop(uri, None)
+
+
+def _open_database(db_path: str, auto_checkpoint: bool) -> _SharedDatabase:
+    """
+    Get the process-wide Database for a path, opening it if needed.
+    
+    The first manager to open a path decides whether it checkpoints automatically.
+    """
+    key = os.path.realpath(db_path)
+    with _DATABASES_LOCK:
+        database = _DATABASES.get(key)
+        if database is None:
+            database = _DATABASES[key] = _SharedDatabase(db_path, auto_checkpoint)
+    if auto_checkpoint != database.auto_checkpoint:
+        logger.warning(f"Database at {db_path} is already open with auto_checkpoint={database.auto_checkpoint}")
+    return database
+
+
+def _iter_rows(result: kuzu.QueryResult, chunk_size: Optional[int] = None) -> Iterator[list]:
+    """
+    Iterate over the rows of a Kuzu query result.
+    
+    When pyarrow is installed the result is fetched as a columnar Arrow table
+    in one call instead of crossing into the binding for every row, and
+    converted to Python values one record batch at a time.
+    """
+    if pyarrow is not None:
+        for batch in result.get_as_arrow(chunk_size).to_batches():
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+    else:
+        while result.has_next():
+            yield result.get_next()
+
+
 class DBManager:
     """
     Manages the storage and retrieval of ATProto records in a Kuzu graph database.
@@ -26,24 +362,139 @@ class DBManager:
         conn: Kuzu Connection instance
     """
     
-    def __init__(self, db_path: str = "./demo_db"):
+    # Search queries, kept constant so their prepared statements can be reused.
+    # {columns} is filled with one of the column lists below.
+    # Kuzu doesn't accept WHERE directly after YIELD, hence the WITH stage.
+    _FTS_QUERY_WITH_COLLECTION = """
+        CALL QUERY_FTS_INDEX('Record', 'content_index', $search_text)
+        YIELD node, score
+        WITH node, score
+        WHERE node.collection = $collection
+        RETURN {columns}
+        ORDER BY score DESC
+        LIMIT $limit
+    """
+    
+    # Without a collection filter the index can stop at the top matches itself
+    _FTS_QUERY_NO_COLLECTION = """
+        CALL QUERY_FTS_INDEX('Record', 'content_index', $search_text, TOP := $limit)
+        YIELD node, score
+        RETURN {columns}
+        ORDER BY score DESC
+        LIMIT $limit
+    """
+    
+    # For FTS extensions that don't accept the TOP option
+    _FTS_QUERY_NO_COLLECTION_NO_TOP = """
+        CALL QUERY_FTS_INDEX('Record', 'content_index', $search_text)
+        YIELD node, score
+        RETURN {columns}
+        ORDER BY score DESC
+        LIMIT $limit
+    """
+    
+    _FTS_COLUMNS = "node.uri as uri, node.collection as collection, score"
+    _FTS_COLUMNS_WITH_CONTENT = _FTS_COLUMNS + ", node.content as content"
+    
+    _BASIC_QUERY_WITH_COLLECTION = """
+        MATCH (:Collection {{name: $collection}})<-[:IN_COLLECTION]-(r:Record)
+        WHERE r.content_lc CONTAINS $needle
+        RETURN {columns}
+        LIMIT $limit
+    """
+    
+    _BASIC_QUERY_NO_COLLECTION = """
+        MATCH (r:Record)
+        WHERE r.content_lc CONTAINS $needle
+        RETURN {columns}
+        LIMIT $limit
+    """
+    
+    _BASIC_COLUMNS = "r.uri as uri, r.collection as collection"
+    _BASIC_COLUMNS_WITH_CONTENT = _BASIC_COLUMNS + ", r.content as content"
+    
+    def __init__(self, db_path: str = "./demo_db", bulk_load_mode: bool = False):
         """
         Initialize a DBManager with a Kuzu database.
         
         Args:
-            db_path: Path to the database directory. If it doesn't exist, it will be created.
+            db_path: Path to the database directory. It is opened, and created if it
+                doesn't exist, when the manager is first used.
+            bulk_load_mode: Disable automatic checkpoints, leaving them to bulk_load().
+                Suited to one-off imports; the WAL grows until a bulk load completes.
         """
         self.db_path = db_path
-        self.create_db_if_not_exists()
-        self.db = kuzu.Database(db_path)
-        self.conn = kuzu.Connection(self.db)
+        self._bulk_load_mode = bulk_load_mode
         logger.info(f"Initialized DBManager with database at: {db_path}")
         
-        # Try to set up full-text search capability
-        try:
-            self.setup_fts_index()
-        except Exception as e:
-            logger.warning(f"Could not initialize full-text search: {e}. Text search will use fallback method.")
+        # Whether self.conn is inside a transaction() block
+        self._in_transaction = False
+        
+        # Whether the FTS extension accepts the TOP option, until a search finds it doesn't
+        self._fts_top = True
+        
+        # URIs written inside the current transaction() block, whose cached
+        # lookups are invalidated again once it commits; None means every URI
+        self._written: Optional[List[str]] = []
+        
+        # Prepared statements keyed by connection and query text; a statement
+        # can only be executed on the connection that prepared it
+        self._statements: Dict[Tuple[int, str], Any] = {}
+    
+    # The database is opened on first use rather than in __init__, so managers
+    # that are created but never queried cost nothing
+    
+    @cached_property
+    def _database(self) -> _SharedDatabase:
+        """The database and its search connections, shared with other managers on the same path."""
+        self.create_db_if_not_exists()
+        return _open_database(self.db_path, auto_checkpoint=not self._bulk_load_mode)
+    
+    @property
+    def db(self) -> kuzu.Database:
+        """The Kuzu database."""
+        return self._database.db
+    
+    @property
+    def _read_pool(self) -> queue.Queue:
+        """Connections used by searches, separate from self.conn used for writes."""
+        return self._database.read_pool
+    
+    @property
+    def _missing(self) -> Dict[str, None]:
+        return self._database.missing
+    
+    @property
+    def _contents(self) -> Dict[str, str]:
+        return self._database.contents
+    
+    def _forget(self, uris: Optional[List[str]]) -> None:
+        """Invalidate the cached lookups of written URIs, or of every URI if None."""
+        self._database.forget(uris)
+        if self._in_transaction:
+            # Other managers can still cache the pre-transaction state until it
+            # commits, so invalidate again then
+            if uris is None or self._written is None:
+                self._written = None
+            else:
+                self._written.extend(uris)
+
+    @cached_property
+    def conn(self) -> kuzu.Connection:
+        """This manager's own connection, used for writes and transactions."""
+        return kuzu.Connection(self.db)
+    
+    @cached_property
+    def _fts_available(self) -> bool:
+        """
+        Whether searches use the FTS index, checked by setting it up on first use.
+        
+        Searches fall back to a basic substring match while it is unavailable.
+        """
+        available = self.setup_fts_index()
+        if not available:
+            logger.warning("Could not initialize full-text search. Text search will use fallback method.")
+        return available
         
     def create_db_if_not_exists(self):
         """Create the database directory if it doesn't exist"""
@@ -51,6 +502,57 @@ class DBManager:
             os.makedirs(self.db_path)
             logger.info(f"Created database directory at: {self.db_path}")
             
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run the writes made in the block on self.conn as one transaction.
+        
+        Nested blocks join the outermost transaction. On error the transaction
+        is rolled back.
+        """
+        if self._in_transaction:
+            yield
+            return
+        
+        self.conn.execute("BEGIN TRANSACTION")
+        self._in_transaction = True
+        self._written = []
+        try:
+            yield
+        except BaseException:
+            self._in_transaction = False
+            try:
+                self.conn.execute("ROLLBACK")
+            except RuntimeError as e:
+                # Kuzu rolls a transaction back itself when one of its statements
+                # fails; don't let the redundant ROLLBACK mask the original error
+                if "No active transaction" not in str(e):
+                    raise
+            # Lookups made inside the block may have cached rolled-back state
+            self._database.forget(None)
+            raise
+        
+        self._in_transaction = False
+        self.conn.execute("COMMIT")
+        self._database.forget(self._written)
+    
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """
+        Run the writes made in the block as one transaction, then checkpoint.
+        
+        Each write otherwise commits on its own. Searches on the read connections
+        don't see the block's writes until it completes. Nested blocks join the
+        outermost transaction. On error the transaction is rolled back.
+        """
+        if self._in_transaction:
+            yield
+            return
+        
+        with self.transaction():
+            yield
+        self.conn.execute("CHECKPOINT")
+    
     def setup_schema(self):
         """
         Set up the database schema based on ATProto lexicons.
@@ -58,19 +560,20 @@ class DBManager:
         This method creates the node and relationship tables needed to
         represent the ATProto data model.
         """
-        try:
+        # Table definitions keyed by table name
+        ddl = {
             # Create User node table
-            self.conn.execute("""
+            'User': """
                 CREATE NODE TABLE User (
                     did STRING PRIMARY KEY,
                     handle STRING,
                     displayName STRING,
                     description STRING
                 )
-            """)
+            """,
             
             # Create Record node table (base for all record types)
-            self.conn.execute("""
+            'Record': """
                 CREATE NODE TABLE Record (
                     uri STRING PRIMARY KEY,
                     cid STRING,
@@ -78,12 +581,13 @@ class DBManager:
                     rkey STRING,
                     createdAt TIMESTAMP,
                     recordType STRING,
-                    content STRING
+                    content STRING,
+                    content_lc STRING
                 )
-            """)
+            """,
             
             # Create sphere table
-            self.conn.execute("""
+            'Sphere': """
                 CREATE NODE TABLE Sphere (
                     uri STRING PRIMARY KEY,
                     title STRING,
@@ -91,29 +595,29 @@ class DBManager:
                     description STRING,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # Create BlipConcept table
-            self.conn.execute("""
+            'BlipConcept': """
                 CREATE NODE TABLE BlipConcept (
                     uri STRING PRIMARY KEY,
                     text STRING,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # Create BlipEmotion table
-            self.conn.execute("""
+            'BlipEmotion': """
                 CREATE NODE TABLE BlipEmotion (
                     uri STRING PRIMARY KEY,
                     type STRING,
                     text STRING,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # Create BlipThought table
-            self.conn.execute("""
+            'BlipThought': """
                 CREATE NODE TABLE BlipThought (
                     uri STRING PRIMARY KEY,
                     type STRING,
@@ -121,28 +625,28 @@ class DBManager:
                     text STRING,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # Create relationship tables
             
             # AUTHORED relationship between User and Record
-            self.conn.execute("""
+            'AUTHORED': """
                 CREATE REL TABLE AUTHORED (
                     FROM User TO Record,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # IN_SPHERE relationship between Record and Sphere
-            self.conn.execute("""
+            'IN_SPHERE': """
                 CREATE REL TABLE IN_SPHERE (
                     FROM Record TO Sphere,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # LINKS relationship for general connections between records
-            self.conn.execute("""
+            'LINKS': """
                 CREATE REL TABLE LINKS (
                     FROM Record TO Record,
                     relType STRING,
@@ -150,24 +654,127 @@ class DBManager:
                     note STRING,
                     createdAt TIMESTAMP
                 )
-            """)
+            """,
             
             # TARGET relationship for records with targets
-            self.conn.execute("""
+            'TARGET': """
                 CREATE REL TABLE TARGET (
                     FROM Record TO Record,
                     createdAt TIMESTAMP
                 )
+            """,
+        }
+        
+        tables = self._table_names()
+        missing = [statement for name, statement in ddl.items() if name not in tables]
+        
+        if not missing:
+            logger.info("Schema already exists, skipping creation")
+        else:
+            try:
+                # Create every missing table in one round trip
+                self.conn.execute(";".join(missing))
+                logger.info(f"Created {len(missing)} schema tables")
+                
+            except Exception as e:
+                if "already exists" not in str(e):
+                    logger.error(f"Error creating schema: {str(e)}")
+                    raise e
+                
+                # Another connection created some of the tables since they were
+                # listed, so create the rest one at a time
+                created = 0
+                for statement in missing:
+                    try:
+                        self.conn.execute(statement)
+                        created += 1
+                    except Exception as e:
+                        if "already exists" not in str(e):
+                            logger.error(f"Error creating schema: {str(e)}")
+                            raise e
+                
+                logger.info(f"Created {created} missing schema tables")
+        
+        if 'Collection' not in tables:
+            self.setup_collection_index()
+        # A Record table created above already has content_lc
+        if 'Record' in tables and 'content_lc' not in self._property_names('Record'):
+            self.setup_lowercase_content()
+        
+        # The FTS index needs the Record table, which may not have existed when
+        # FTS was last checked; forget a failed check so it is made once more
+        if not self.__dict__.get('_fts_available'):
+            self.__dict__.pop('_fts_available', None)
+            self._fts_available
+    
+    def _table_names(self) -> set:
+        """Get the names of the node and relationship tables in the database."""
+        result = self.conn.execute("CALL show_tables() RETURN name")
+        return {row[0] for row in _iter_rows(result)}
+    
+    def _property_names(self, table: str) -> set:
+        """Get the names of a table's properties."""
+        result = self.conn.execute(f"CALL table_info('{table}') RETURN name")
+        return {row[0] for row in _iter_rows(result)}
+    
+    def setup_collection_index(self):
+        """
+        Set up the Collection node table used to look up records by collection.
+        
+        Kuzu only indexes primary keys, so each record is linked to a Collection
+        node keyed by name. Matching through that node avoids scanning every
+        Record to filter on its collection property. Existing records are
+        linked when the table is first created.
+        """
+        try:
+            self.conn.execute("""
+                CREATE NODE TABLE Collection (
+                    name STRING PRIMARY KEY
+                )
             """)
             
-            logger.info("Successfully created database schema")
-            
+            # IN_COLLECTION relationship between Record and its Collection
+            self.conn.execute("""
+                CREATE REL TABLE IN_COLLECTION (
+                    FROM Record TO Collection
+                )
+            """)
         except Exception as e:
             if "already exists" in str(e):
-                logger.info("Schema already exists, skipping creation")
-            else:
-                logger.error(f"Error creating schema: {str(e)}")
-                raise e
+                return
+            logger.error(f"Error creating collection index: {str(e)}")
+            raise e
+        
+        # Link records stored before the Collection table existed
+        self.conn.execute("""
+            MATCH (r:Record)
+            WHERE r.collection IS NOT NULL
+            MERGE (c:Collection {name: r.collection})
+            MERGE (r)-[:IN_COLLECTION]->(c)
+        """)
+        logger.info("Created collection index")
+    
+    def setup_lowercase_content(self):
+        """
+        Add the lowercased copy of record content used by the basic search.
+        
+        Records stored before the content_lc property existed are backfilled
+        when it is first added.
+        """
+        try:
+            self.conn.execute("ALTER TABLE Record ADD content_lc STRING")
+        except Exception as e:
+            if "already has property" in str(e):
+                return
+            logger.error(f"Error adding lowercase content: {str(e)}")
+            raise e
+        
+        self.conn.execute("""
+            MATCH (r:Record)
+            WHERE r.content_lc IS NULL
+            SET r.content_lc = lower(r.content)
+        """)
+        logger.info("Added lowercase content to records")
     
     def store_user(self, did: str, handle: str, display_name: str, description: str = None) -> None:
         """
@@ -187,7 +794,7 @@ class DBManager:
                     u.description = $description
             """
             
-            self.conn.execute(query, {
+            self.conn.execute(self._prepare(query), {
                 'did': did,
                 'handle': handle,
                 'displayName': display_name,
@@ -216,163 +823,231 @@ class DBManager:
         """
         try:
             # Convert record to JSON string
-            record_json = json.dumps(record)
+            record_json = _dumps(record)
             
             # Extract the record type from the collection
             record_type = collection.split('.')[-1]
             
             # Store the base record
-            # Use proper datetime object for Kuzu's TIMESTAMP type
-            created_at_str = record.get('createdAt', datetime.now().isoformat())
-            try:
-                # Parse ISO format string to datetime object
-                if isinstance(created_at_str, str):
-                    created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                else:
-                    created_at = created_at_str
-            except Exception as e:
-                logger.warning(f"Error parsing timestamp {created_at_str}: {e}. Using current time.")
-                created_at = datetime.now()
+            created_at = _parse_created_at(record)
             
             # Insert record into appropriate node table based on type
-            if "sphere.core" in collection:
-                self.conn.execute("""
-                    MERGE (s:Sphere {uri: $uri})
-                    SET s.title = $title,
-                        s.text = $text,
-                        s.description = $description,
-                        s.createdAt = $createdAt
-                """, {
-                    'uri': uri,
-                    'title': record.get('title', ''),
-                    'text': record.get('text', ''),
-                    'description': record.get('description', ''),
-                    'createdAt': created_at
-                })
-            
-            elif "blip.concept" in collection:
-                self.conn.execute("""
-                    MERGE (c:BlipConcept {uri: $uri})
-                    SET c.text = $text,
-                        c.createdAt = $createdAt
-                """, {
-                    'uri': uri,
-                    'text': record.get('text', ''),
-                    'createdAt': created_at
-                })
-            
-            elif "blip.emotion" in collection:
-                self.conn.execute("""
-                    MERGE (e:BlipEmotion {uri: $uri})
-                    SET e.type = $type,
-                        e.text = $text,
-                        e.createdAt = $createdAt
-                """, {
-                    'uri': uri,
-                    'type': record.get('type', ''),
-                    'text': record.get('text', ''),
-                    'createdAt': created_at
-                })
-            
-            elif "blip.thought" in collection:
-                self.conn.execute("""
-                    MERGE (t:BlipThought {uri: $uri})
-                    SET t.type = $type,
-                        t.context = $context,
-                        t.text = $text,
-                        t.createdAt = $createdAt
-                """, {
-                    'uri': uri,
-                    'type': record.get('type', ''),
-                    'context': record.get('context', ''),
-                    'text': record.get('text', ''),
-                    'createdAt': created_at
-                })
+            label = _collection_label(collection)
+            if label:
+                self.conn.execute(
+                    self._prepare(_NODE_QUERIES[label]),
+                    _node_row(label, uri, record, created_at)
+                )
             
-            # Also insert into the base Record table for unified queries
-            self.conn.execute("""
+            # Also insert into the base Record table for unified queries and
+            # attach it to its author in the same statement, creating the User
+            # if it hasn't been stored yet
+            self.conn.execute(self._prepare("""
                 MERGE (r:Record {uri: $uri})
                 SET r.cid = $cid,
                     r.collection = $collection,
                     r.rkey = $rkey,
                     r.createdAt = $createdAt,
                     r.recordType = $recordType,
-                    r.content = $content
-            """, {
+                    r.content = $content,
+                    r.content_lc = $content_lc
+                WITH r
+                MERGE (c:Collection {name: $collection})
+                MERGE (r)-[:IN_COLLECTION]->(c)
+                WITH r
+                MERGE (u:User {did: $did})
+                MERGE (u)-[authored:AUTHORED]->(r)
+                SET authored.createdAt = $createdAt
+            """), {
                 'uri': uri,
                 'cid': cid,
                 'collection': collection,
                 'rkey': rkey,
                 'createdAt': created_at,
                 'recordType': record_type,
-                'content': record_json
-            })
-            
-            # Create AUTHORED relationship
-            self.conn.execute("""
-                MATCH (u:User {did: $did})
-                MATCH (r:Record {uri: $uri})
-                MERGE (u)-[rel:AUTHORED]->(r)
-                SET rel.createdAt = $createdAt
-            """, {
-                'did': author_did,
-                'uri': uri,
-                'createdAt': created_at
+                'content': record_json,
+                'content_lc': record_json.lower(),
+                'did': author_did
             })
             
             # If sphere_uri is provided, create IN_SPHERE relationship
             if sphere_uri:
-                self.conn.execute("""
-                    MATCH (r:Record {uri: $uri})
-                    MATCH (s:Sphere {uri: $sphere_uri})
+                self.conn.execute(self._prepare("""
+                    MATCH (r:Record {uri: $uri}), (s:Sphere {uri: $sphere_uri})
                     MERGE (r)-[rel:IN_SPHERE]->(s)
                     SET rel.createdAt = $createdAt
-                """, {
+                """), {
                     'uri': uri,
                     'sphere_uri': sphere_uri,
                     'createdAt': created_at
                 })
             
-            # Check for target in the record and create TARGET relationship
-            if 'target' in record:
-                target_uri = record['target']
-                self.conn.execute("""
-                    MATCH (r:Record {uri: $uri})
-                    MATCH (t:Record {uri: $target_uri})
+            # Check for target in the record and create TARGET relationship;
+            # targets may be plain URIs or strong references
+            target_uri = record.get('target')
+            if isinstance(target_uri, dict):
+                target_uri = target_uri.get('uri')
+            if target_uri and collection == "me.comind.relationship.link" and "relationship" in record:
+                # A relationship link is also a LINKS edge to its target, merged
+                # with the TARGET edge since both join the same two records
+                self.conn.execute(self._prepare("""
+                    MATCH (r:Record {uri: $uri}), (t:Record {uri: $target_uri})
+                    MERGE (r)-[target:TARGET]->(t)
+                    SET target.createdAt = $createdAt
+                    MERGE (r)-[link:LINKS]->(t)
+                    SET link.relType = $rel_type,
+                        link.strength = $strength,
+                        link.note = $note,
+                        link.createdAt = $createdAt
+                """), {
+                    'uri': uri,
+                    'target_uri': target_uri,
+                    'rel_type': record.get("relationship", ""),
+                    'strength': record.get("strength", 1.0),
+                    'note': record.get("note", ""),
+                    'createdAt': created_at
+                })
+            elif target_uri:
+                self.conn.execute(self._prepare("""
+                    MATCH (r:Record {uri: $uri}), (t:Record {uri: $target_uri})
                     MERGE (r)-[rel:TARGET]->(t)
                     SET rel.createdAt = $createdAt
-                """, {
+                """), {
                     'uri': uri,
                     'target_uri': target_uri,
                     'createdAt': created_at
                 })
+            
+            logger.debug(f"Stored record: {collection}/{rkey if rkey else ''}")
+            
+        except Exception as e:
+            logger.error(f"Error storing record {uri}: {str(e)}")
+            raise e
+        
+        finally:
+            # Even a partial write changes what a lookup of the URI returns
+            self._forget([uri])
+    
+    def store_records_bulk(self, records: List[Dict]) -> None:
+        """
+        Store many ATProto records with one UNWIND query per table.
+        
+        Equivalent to calling store_record for each record, but issues a fixed
+        number of queries per batch instead of several per record. Relationships
+        whose endpoints don't exist are skipped, as in store_record, and a URI
+        given more than once is stored with its last record.
+        
+        Args:
+            records: Dictionaries of store_record keyword arguments (collection,
+                record, uri, cid, author_did, and optionally rkey and sphere_uri)
+        """
+        # A URI merged twice in one UNWIND query violates the primary key
+        records = list({item['uri']: item for item in records}.values())
+        
+        # The UNWIND queries join against whole tables, while store_record's
+        # parameterized MATCHes are primary-key lookups; a lone record is
+        # cheaper stored directly
+        if len(records) == 1:
+            self.store_record(**records[0])
+            return
+        
+        record_rows = []
+        node_rows: Dict[str, List[Dict]] = {label: [] for label in _BULK_NODE_QUERIES}
+        authored_rows = []
+        in_sphere_rows = []
+        target_rows = []
+        links_rows = []
+        
+        for item in records:
+            collection = item['collection']
+            record = item['record']
+            uri = item['uri']
+            created_at = _parse_created_at(record)
+            content = _dumps(record)
+            
+            record_rows.append({
+                'uri': uri,
+                'cid': item.get('cid') or "",
+                'collection': collection,
+                # Kuzu can't bind a column that is NULL in every row, so derive the rkey
+                'rkey': item.get('rkey') or uri.rsplit('/', 1)[-1],
+                'createdAt': created_at,
+                'recordType': collection.split('.')[-1],
+                'content': content,
+                'content_lc': content.lower()
+            })
+            
+            label = _collection_label(collection)
+            if label:
+                node_rows[label].append(_node_row(label, uri, record, created_at))
+            
+            authored_rows.append({'did': item['author_did'], 'uri': uri, 'createdAt': created_at})
+            
+            if item.get('sphere_uri'):
+                in_sphere_rows.append({
+                    'uri': uri,
+                    'sphere_uri': item['sphere_uri'],
+                    'createdAt': created_at
+                })
+            
+            # Targets may be plain URIs or strong references
+            target = record.get('target')
+            if isinstance(target, dict):
+                target = target.get('uri')
+            if target:
+                target_rows.append({'uri': uri, 'target_uri': target, 'createdAt': created_at})
                 
-            # Handle relationship links
-            if collection == "me.comind.relationship.link" and "relationship" in record:
-                from_uri = uri
-                to_uri = record.get("target", "")
-                if to_uri:
-                    self.conn.execute("""
-                        MATCH (from:Record {uri: $from_uri})
-                        MATCH (to:Record {uri: $to_uri})
-                        MERGE (from)-[rel:LINKS]->(to)
-                        SET rel.relType = $rel_type,
-                            rel.strength = $strength,
-                            rel.note = $note,
-                            rel.createdAt = $createdAt
-                    """, {
-                        'from_uri': from_uri,
-                        'to_uri': to_uri,
-                        'rel_type': record.get("relationship", ""),
-                        'strength': record.get("strength", 1.0),
-                        'note': record.get("note", ""),
+                if collection == "me.comind.relationship.link" and "relationship" in record:
+                    # Null fields get typed defaults, like missing ones
+                    strength = record.get("strength")
+                    links_rows.append({
+                        'from_uri': uri,
+                        'to_uri': target,
+                        'rel_type': record.get("relationship") or "",
+                        'strength': float(strength) if strength is not None else 1.0,
+                        'note': record.get("note") or "",
                         'createdAt': created_at
                     })
+        
+        # Nodes first so relationships within the batch can find both endpoints
+        batches = [(_BULK_RECORD_QUERY, record_rows)]
+        batches.extend((_BULK_NODE_QUERIES[label], rows) for label, rows in node_rows.items())
+        batches.extend([
+            (_BULK_AUTHORED_QUERY, authored_rows),
+            (_BULK_IN_SPHERE_QUERY, in_sphere_rows),
+            (_BULK_TARGET_QUERY, target_rows),
+            (_BULK_LINKS_QUERY, links_rows),
+        ])
+        
+        # Authors and collections are merged separately since a repeated key in one
+        # UNWIND MERGE can violate the primary key on some Kuzu versions
+        author_dids = list({row['did'] for row in authored_rows})
+        collection_names = list({row['collection'] for row in record_rows})
+        in_collection_rows = [
+            {'uri': row['uri'], 'collection': row['collection']} for row in record_rows
+        ]
+        
+        try:
+            # One commit for the whole batch, which is stored completely or not at all
+            with self.transaction():
+                self._forget([row['uri'] for row in record_rows])
+                
+                if author_dids:
+                    self.conn.execute(self._prepare(_BULK_USER_QUERY), {'dids': author_dids})
+                
+                for query, rows in batches:
+                    # Kuzu rejects UNWIND over an empty list parameter
+                    if rows:
+                        self.conn.execute(self._prepare(query), {'rows': rows})
+                
+                if collection_names:
+                    self.conn.execute(self._prepare(_BULK_COLLECTION_QUERY), {'names': collection_names})
+                    self.conn.execute(self._prepare(_BULK_IN_COLLECTION_QUERY), {'rows': in_collection_rows})
             
-            logger.debug(f"Stored record: {collection}/{rkey if rkey else ''}")
+            logger.debug(f"Stored {len(record_rows)} records in bulk")
             
         except Exception as e:
-            logger.error(f"Error storing record {uri}: {str(e)}")
+            logger.error(f"Error storing {len(record_rows)} records in bulk: {str(e)}")
             raise e
     
     def get_record(self, collection: str, rkey: str) -> Optional[Dict]:
@@ -388,12 +1063,12 @@ class DBManager:
         """
         try:
             query = """
-                MATCH (r:Record)
-                WHERE r.collection = $collection AND r.rkey = $rkey
+                MATCH (:Collection {name: $collection})<-[:IN_COLLECTION]-(r:Record)
+                WHERE r.rkey = $rkey
                 RETURN r.content as content
             """
             
-            result = self.conn.execute(query, {
+            result = self.conn.execute(self._prepare(query), {
                 'collection': collection,
                 'rkey': rkey
             })
@@ -401,7 +1076,7 @@ class DBManager:
             if result.has_next():
                 row = result.get_next()
                 content = row[0]
-                return json.loads(content)
+                return _loads(content)
             else:
                 return None
                 
@@ -419,63 +1094,117 @@ class DBManager:
         Returns:
             The record as a dictionary if found, None otherwise
         """
+        if uri in self._missing:
+            return None
+        
+        # Decode cached content afresh so callers can't mutate the cache
+        content = self._contents.get(uri)
+        if content is not None:
+            return _loads(content)
+        
+        generation = self._database.generation
         try:
             query = """
                 MATCH (r:Record {uri: $uri})
                 RETURN r.content as content
             """
             
-            result = self.conn.execute(query, {'uri': uri})
+            result = self.conn.execute(self._prepare(query), {'uri': uri})
             
             if result.has_next():
                 row = result.get_next()
                 content = row[0]
-                return json.loads(content)
+                # Inside a transaction the lookup sees uncommitted writes, which
+                # other managers mustn't read from the shared cache
+                if not self._in_transaction:
+                    self._database.remember_content(uri, content, generation)
+                return _loads(content)
             else:
+                if not self._in_transaction:
+                    self._database.remember_missing(uri, generation)
                 return None
                 
         except Exception as e:
             logger.error(f"Error retrieving record with URI {uri}: {str(e)}")
             raise e
     
-    def list_records(self, collection: str) -> List[Dict]:
+    def record_exists(self, uri: str) -> bool:
         """
-        List all records in a collection.
+        Check whether a record is in the database without fetching its content.
         
         Args:
-            collection: The collection to list records from
+            uri: The URI of the record
             
         Returns:
-            A list of record dictionaries
+            True if the record exists, False otherwise
+        """
+        if uri in self._missing:
+            return False
+        if uri in self._contents:
+            return True
+        
+        generation = self._database.generation
+        try:
+            result = self.conn.execute(self._prepare("""
+                MATCH (r:Record {uri: $uri})
+                RETURN 1
+            """), {'uri': uri})
+            
+            if result.has_next():
+                return True
+            # Inside a transaction the lookup sees uncommitted deletes
+            if not self._in_transaction:
+                self._database.remember_missing(uri, generation)
+            return False
+                
+        except Exception as e:
+            logger.error(f"Error checking for record with URI {uri}: {str(e)}")
+            raise e
+    
+    def iter_records(self, collection: str, batch_size: int = LIST_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Iterate over the records in a collection.
+        
+        The collection is read with a single query rather than in pages; its
+        result is decoded as it is consumed, so only one batch of record
+        dictionaries is built at a time.
+        
+        Args:
+            collection: The collection to list records from
+            batch_size: Number of rows converted from the query result at a time
+            
+        Yields:
+            Record dictionaries
         """
         try:
             query = """
-                MATCH (r:Record)
-                WHERE r.collection = $collection
+                MATCH (:Collection {name: $collection})<-[:IN_COLLECTION]-(r:Record)
                 RETURN r.uri as uri, r.cid as cid, r.rkey as rkey, r.content as content
             """
             
-            result = self.conn.execute(query, {'collection': collection})
-            records = []
+            result = self.conn.execute(self._prepare(query), {'collection': collection})
             
-            while result.has_next():
-                row = result.get_next()
-                uri, cid, rkey, content = row
-                record = {
-                    'uri': uri,
-                    'cid': cid,
-                    'rkey': rkey,
-                    'value': json.loads(content)
-                }
-                records.append(record)
-                
-            return records
+            for row in _iter_rows(result, batch_size):
+                yield {'uri': row[0], 'cid': row[1], 'rkey': row[2], 'value': _loads(row[3])}
                 
         except Exception as e:
             logger.error(f"Error listing records in collection {collection}: {str(e)}")
             raise e
     
-    def query_relationships(self, source_uri: str, rel_type: str = None, max_depth: int = 1) -> List[Dict]:
+    def list_records(self, collection: str) -> List[Dict]:
+        """
+        List all records in a collection.
+        
+        Args:
+            collection: The collection to list records from
+            
+        Returns:
+            A list of record dictionaries
+        """
+        return list(self.iter_records(collection))
+    
+    def query_relationships(self, source_uri: str, rel_type: str = None, max_depth: int = 1,
+                            include_content: bool = True) -> List[Dict]:
         """
         Query relationships from a source record.
         
@@ -483,132 +1212,83 @@ class DBManager:
             source_uri: The URI of the source record
             rel_type: The type of relationship to query (optional)
             max_depth: Maximum depth for traversal (default: 1)
+            include_content: Whether to fetch and decode each target's content as
+                target_data; skip it when only the graph structure is needed
             
         Returns:
             A list of related records with relationship information
         """
         try:
-            # Kuzu doesn't directly return paths as objects we can process
-            # So we'll query the relationships and construct the results manually
-            relationships = []
+            max_depth = int(max_depth)
+            if max_depth < 1:
+                return []
             
+            rel_filter = "WHERE rel.relType = $rel_type" if rel_type else ""
+            params = {}
             if rel_type:
-                # Query specific relationship type
-                query = f"""
-                    MATCH (source:Record {{uri: $source_uri}})-[rel:LINKS]->(target:Record)
-                    WHERE rel.relType = $rel_type
-                    RETURN source.uri as source_uri,
-                           target.uri as target_uri,
-                           target.collection as target_collection,
-                           target.content as target_content,
-                           rel.relType as rel_type,
-                           rel.strength as strength,
-                           rel.note as note,
-                           rel.createdAt as created_at
-                """
-                params = {'source_uri': source_uri, 'rel_type': rel_type}
-            else:
-                # Query any relationship
-                query = """
-                    MATCH (source:Record {uri: $source_uri})-[rel:LINKS]->(target:Record)
-                    RETURN source.uri as source_uri,
-                           target.uri as target_uri,
-                           target.collection as target_collection,
-                           target.content as target_content,
-                           rel.relType as rel_type,
-                           rel.strength as strength,
-                           rel.note as note,
-                           rel.createdAt as created_at
-                """
-                params = {'source_uri': source_uri}
-            
-            result = self.conn.execute(query, params)
-            
-            # Process first level relationships
-            first_level_targets = set()
-            
-            while result.has_next():
-                row = result.get_next()
-                source_uri, target_uri, target_collection, target_content, rel_type, strength, note, created_at = row
-                
-                # Add to results
-                rel_data = {
-                    'source_uri': source_uri,
-                    'target_uri': target_uri,
-                    'target_collection': target_collection,
-                    'target_data': json.loads(target_content),
-                    'relationship': {
-                        'type': rel_type,
-                        'strength': strength if strength is not None else 1.0,
-                        'note': note,
-                        'created_at': created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
-                    },
-                    'depth': 1
-                }
-                relationships.append(rel_data)
-                first_level_targets.add(target_uri)
-            
-            # If max_depth > 1, get next levels
-            current_depth = 1
-            current_sources = first_level_targets
-            
-            while current_depth < max_depth and current_sources:
-                next_sources = set()
+                params['rel_type'] = rel_type
+            
+            target_content = "target.content" if include_content else "NULL"
+            
+            # The LINKS out of every record in the current frontier. Expanding one
+            # level at a time costs at most max_depth queries; a variable-length
+            # pattern enumerates every walk, which grows exponentially with depth
+            # on cyclic graphs.
+            query = f"""
+                UNWIND $frontier AS frontier_uri
+                MATCH (source:Record {{uri: frontier_uri}})-[rel:LINKS]->(target:Record)
+                {rel_filter}
+                RETURN source.uri as source_uri,
+                       target.uri as target_uri,
+                       target.collection as target_collection,
+                       {target_content} as target_content,
+                       rel.relType as rel_type,
+                       rel.strength as strength,
+                       rel.note as note,
+                       rel.createdAt as created_at
+            """
+            
+            relationships = []
+            
+            # Breadth-first search with a visited set: each record is expanded
+            # once, from the level at which it was first reached, so hops out of
+            # a record revisited later (e.g. around a cycle) are not followed.
+            visited = {source_uri}
+            frontier = [source_uri]
+            
+            # Traversals run on the search connections so concurrent callers
+            # don't queue behind each other or behind writes on self.conn
+            with self._read_conn() as conn:
+                statement = self._prepare(query, conn)
                 
-                for current_source in current_sources:
-                    if rel_type:
-                        query = """
-                            MATCH (source:Record {uri: $source_uri})-[rel:LINKS]->(target:Record)
-                            WHERE rel.relType = $rel_type
-                            RETURN source.uri as source_uri,
-                                  target.uri as target_uri,
-                                  target.collection as target_collection,
-                                  target.content as target_content,
-                                  rel.relType as rel_type,
-                                  rel.strength as strength,
-                                  rel.note as note,
-                                  rel.createdAt as created_at
-                        """
-                        params = {'source_uri': current_source, 'rel_type': rel_type}
-                    else:
-                        query = """
-                            MATCH (source:Record {uri: $source_uri})-[rel:LINKS]->(target:Record)
-                            RETURN source.uri as source_uri,
-                                  target.uri as target_uri,
-                                  target.collection as target_collection,
-                                  target.content as target_content,
-                                  rel.relType as rel_type,
-                                  rel.strength as strength,
-                                  rel.note as note,
-                                  rel.createdAt as created_at
-                        """
-                        params = {'source_uri': current_source}
+                for depth in range(1, max_depth + 1):
+                    if not frontier:
+                        break
                     
-                    result = self.conn.execute(query, params)
+                    params['frontier'] = frontier
+                    rows = list(_iter_rows(conn.execute(statement, params)))
+                    frontier = []
                     
-                    while result.has_next():
-                        row = result.get_next()
-                        src_uri, tgt_uri, tgt_collection, tgt_content, r_type, r_strength, r_note, r_created_at = row
+                    for row in rows:
+                        if row[1] not in visited:
+                            visited.add(row[1])
+                            frontier.append(row[1])
                         
-                        # Add to results
-                        rel_data = {
-                            'source_uri': src_uri,
-                            'target_uri': tgt_uri,
-                            'target_collection': tgt_collection,
-                            'target_data': json.loads(tgt_content),
+                        created_at = row[7]
+                        relationships.append({
+                            'source_uri': row[0],
+                            'target_uri': row[1],
+                            'target_collection': row[2],
                             'relationship': {
-                                'type': r_type,
-                                'strength': r_strength if r_strength is not None else 1.0,
-                                'note': r_note,
-                                'created_at': r_created_at.isoformat() if hasattr(r_created_at, 'isoformat') else str(r_created_at)
+                                'type': row[4],
+                                'strength': row[5] if row[5] is not None else 1.0,
+                                'note': row[6],
+                                'created_at': created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
                             },
-                            'depth': current_depth + 1
-                        }
-                        relationships.append(rel_data)
-                        next_sources.add(tgt_uri)
-                
-                current_sources = next_sources
-                current_depth += 1
+                            'depth': depth
+                        })
+                        if include_content:
+                            relationships[-1]['target_data'] = _loads(row[3])
                 
             return relationships
                 
@@ -630,12 +1310,12 @@ class DBManager:
         try:
             # Find the URI first
             query = """
-                MATCH (r:Record)
-                WHERE r.collection = $collection AND r.rkey = $rkey
+                MATCH (:Collection {name: $collection})<-[:IN_COLLECTION]-(r:Record)
+                WHERE r.rkey = $rkey
                 RETURN r.uri as uri
             """
             
-            result = self.conn.execute(query, {
+            result = self.conn.execute(self._prepare(query), {
                 'collection': collection,
                 'rkey': rkey
             })
@@ -646,27 +1326,17 @@ class DBManager:
                 
             uri = result.get_next()[0]
             
-            # Delete relationships first
-            self.conn.execute("""
-                MATCH (r:Record {uri: $uri})-[rel]-()
-                DELETE rel
-            """, {'uri': uri})
-            
             # Delete the record from its specific type table
-            if "sphere.core" in collection:
-                self.conn.execute("MATCH (s:Sphere {uri: $uri}) DELETE s", {'uri': uri})
-            elif "blip.concept" in collection:
-                self.conn.execute("MATCH (c:BlipConcept {uri: $uri}) DELETE c", {'uri': uri})
-            elif "blip.emotion" in collection:
-                self.conn.execute("MATCH (e:BlipEmotion {uri: $uri}) DELETE e", {'uri': uri})
-            elif "blip.thought" in collection:
-                self.conn.execute("MATCH (t:BlipThought {uri: $uri}) DELETE t", {'uri': uri})
-            
-            # Delete from the Record table
-            self.conn.execute("""
+            label = _collection_label(collection)
+            if label:
+                self.conn.execute(self._prepare(f"MATCH (n:{label} {{uri: $uri}}) DETACH DELETE n"), {'uri': uri})
+            
+            # Delete from the Record table along with all of its relationships
+            self.conn.execute(self._prepare("""
                 MATCH (r:Record {uri: $uri})
-                DELETE r
-            """, {'uri': uri})
+                DETACH DELETE r
+            """), {'uri': uri})
+            self._forget([uri])
             
             logger.info(f"Deleted record: {collection}/{rkey}")
             return True
@@ -686,73 +1356,26 @@ class DBManager:
             The number of records deleted
         """
         try:
-            # Count records first
-            query = """
-                MATCH (r:Record)
-                WHERE r.collection = $collection
+            # Delete specific type records by joining against the base Record table
+            label = _collection_label(collection)
+            if label:
+                self.conn.execute(self._prepare(f"""
+                    MATCH (:Collection {{name: $collection}})<-[:IN_COLLECTION]-(r:Record), (n:{label})
+                    WHERE n.uri = r.uri
+                    DETACH DELETE n
+                """), {'collection': collection})
+            
+            # Delete from Record table along with all of its relationships,
+            # counting the records as they go
+            result = self.conn.execute(self._prepare("""
+                MATCH (:Collection {name: $collection})<-[:IN_COLLECTION]-(r:Record)
+                DETACH DELETE r
                 RETURN count(r) as count
-            """
-            
-            result = self.conn.execute(query, {'collection': collection})
-            count = 0
-            if result.has_next():
-                count = result.get_next()[0]
-            
-            # No records to delete
-            if count == 0:
-                return 0
-            
-            # Get all records in the collection
-            query = """
-                MATCH (r:Record)
-                WHERE r.collection = $collection
-                RETURN r.uri as uri
-            """
-            
-            result = self.conn.execute(query, {'collection': collection})
-            uris = []
-            while result.has_next():
-                uris.append(result.get_next()[0])
-            
-            # Delete relationships for all records
-            for uri in uris:
-                self.conn.execute("""
-                    MATCH (r:Record {uri: $uri})-[rel]-()
-                    DELETE rel
-                """, {'uri': uri})
-            
-            # Delete specific type records
-            if "sphere.core" in collection:
-                self.conn.execute("""
-                    MATCH (s:Sphere)
-                    WHERE s.uri IN $uris
-                    DELETE s
-                """, {'uris': uris})
-            elif "blip.concept" in collection:
-                self.conn.execute("""
-                    MATCH (c:BlipConcept)
-                    WHERE c.uri IN $uris
-                    DELETE c
-                """, {'uris': uris})
-            elif "blip.emotion" in collection:
-                self.conn.execute("""
-                    MATCH (e:BlipEmotion)
-                    WHERE e.uri IN $uris
-                    DELETE e
-                """, {'uris': uris})
-            elif "blip.thought" in collection:
-                self.conn.execute("""
-                    MATCH (t:BlipThought)
-                    WHERE t.uri IN $uris
-                    DELETE t
-                """, {'uris': uris})
+            """), {'collection': collection})
+            count = result.get_next()[0] if result.has_next() else 0
             
-            # Delete from Record table
-            self.conn.execute("""
-                MATCH (r:Record)
-                WHERE r.collection = $collection
-                DELETE r
-            """, {'collection': collection})
+            # The deleted URIs aren't known up front, so drop every cached lookup
+            self._forget(None)
             
             logger.info(f"Cleared collection {collection}: deleted {count} records")
             return count
@@ -761,31 +1384,77 @@ class DBManager:
             logger.error(f"Error clearing collection {collection}: {str(e)}")
             raise e
     
+    def _prepare(self, query: str, conn: kuzu.Connection = None) -> Union[str, kuzu.PreparedStatement]:
+        """
+        Get a cached prepared statement for a query, preparing it on first use.
+        
+        Returns the query string unchanged if the binding has no prepare() or
+        preparation fails, so that execute() plans it and reports any error.
+        
+        Args:
+            query: The query text
+            conn: The connection the statement will be executed on (default: self.conn)
+        """
+        conn = conn or self.conn
+        key = (id(conn), query)
+        statement = self._statements.get(key)
+        if statement is None:
+            if not hasattr(conn, 'prepare'):
+                return query
+            statement = conn.prepare(query)
+            if not statement.is_success():
+                return query
+            self._statements[key] = statement
+        return statement
+    
+    @contextmanager
+    def _read_conn(self) -> Iterator[kuzu.Connection]:
+        """Check out a search connection from the pool, waiting if all are in use."""
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+    
     def setup_fts_index(self):
         """
         Set up full-text search indexes for the database.
-        This needs to be called once to enable full-text search.
+        
+        The extension is only installed when it can't be loaded, and the index
+        is only created when the catalog doesn't already list it.
         """
         try:
-            # Install and load FTS extension
-            self.conn.execute("INSTALL FTS")
-            self.conn.execute("LOAD FTS")
+            # Index name -> whether its extension is loaded in this process
+            result = self.conn.execute("CALL show_indexes() RETURN *")
+            indexes = {row[1]: row[4] for row in _iter_rows(result)}
+            
+            if not indexes.get('content_index'):
+                self._load_fts_extension()
             
             # Create FTS indexes for Record content
-            self.conn.execute("""
-                CALL CREATE_FTS_INDEX('Record', 'content_index', ['content'])
-            """)
+            if 'content_index' not in indexes:
+                self.conn.execute("""
+                    CALL CREATE_FTS_INDEX('Record', 'content_index', ['content'])
+                """)
+                logger.info("Full-text search indexes created successfully")
             
-            logger.info("Full-text search indexes created successfully")
             return True
         except Exception as e:
-            # If already exists, just log and continue
+            # Another connection may have created the index since it was listed
             if "already exists" in str(e):
                 logger.info("Full-text search indexes already exist")
                 return True
             logger.error(f"Error setting up full-text search indexes: {str(e)}")
             return False
     
+    def _load_fts_extension(self):
+        """Load the FTS extension, downloading it first if it isn't installed."""
+        try:
+            self.conn.execute("LOAD EXTENSION FTS")
+        except Exception:
+            self.conn.execute("INSTALL FTS")
+            self.conn.execute("LOAD EXTENSION FTS")
+    
     def find_similar_records(self, text: str, collection: str = None, limit: int = 10) -> List[Dict]:
         """
         Find records with similar text content using full-text search.
@@ -798,113 +1467,118 @@ class DBManager:
         Returns:
             List of matching records
         """
-        try:
-            # Try to ensure FTS is installed
+        return self._find_similar(text, collection, limit, include_content=True)
+    
+    def find_similar_uris(self, text: str, collection: str = None, limit: int = 10) -> List[Dict]:
+        """
+        Find records with similar text content without loading their content.
+        
+        Cheaper than find_similar_records when only the matches themselves are
+        needed, e.g. for ranking or deduplication.
+        
+        Args:
+            text: The text to search for
+            collection: Optional collection to limit the search to
+            limit: Maximum number of results to return
+            
+        Returns:
+            List of matches with uri, collection and, when FTS is used, score
+        """
+        return self._find_similar(text, collection, limit, include_content=False)
+    
+    def _find_similar(self, text: str, collection: str, limit: int, include_content: bool) -> List[Dict]:
+        """
+        Search with FTS when available, falling back to a basic substring match.
+        
+        Only the words of the text are passed to FTS, so unusually long or
+        punctuation-heavy input doesn't turn into an unbounded index query.
+        """
+        # Text without any words, e.g. only punctuation, can't match in the index
+        terms = _fts_terms(text) if self._fts_available else ""
+        if terms:
             try:
-                self.setup_fts_index()
+                return self._find_records_fts(terms, collection, limit, include_content)
             except Exception as e:
-                logger.warning(f"Could not set up FTS index: {e}. Using basic search.")
-                return self._find_records_basic(text, collection, limit)
-            
-            # Use FTS query
-            if collection:
-                # With collection filter
-                query = f"""
-                    CALL QUERY_FTS_INDEX('Record', 'content_index', $search_text) 
-                    YIELD node, score
-                    WITH node, score
-                    WHERE node.collection = $collection
-                    RETURN node.uri as uri, node.content as content, node.collection as collection, score
-                    ORDER BY score DESC
-                    LIMIT $limit
-                """
-                params = {'search_text': text, 'collection': collection, 'limit': limit}
-            else:
-                # Without collection filter
-                query = f"""
-                    CALL QUERY_FTS_INDEX('Record', 'content_index', $search_text) 
-                    YIELD node, score
-                    WITH node, score
-                    RETURN node.uri as uri, node.content as content, node.collection as collection, score
-                    ORDER BY score DESC
-                    LIMIT $limit
-                """
-                params = {'search_text': text, 'limit': limit}
-            
-            result = self.conn.execute(query, params)
-            matches = []
-            
-            while result.has_next():
-                row = result.get_next()
-                uri, content, collection, score = row
-                matches.append({
-                    'uri': uri,
-                    'collection': collection,
-                    'value': json.loads(content),
-                    'score': score
-                })
-                
-            return matches
-                
-        except Exception as e:
-            logger.error(f"Error finding similar records with FTS: {str(e)}")
-            # Fall back to basic search if FTS fails
-            return self._find_records_basic(text, collection, limit)
+                if _fts_missing(e):
+                    # Stop using FTS so later searches don't fail the same way first
+                    logger.error(f"Full-text search is unavailable, disabling it: {str(e)}")
+                    self._fts_available = False
+                else:
+                    logger.error(f"Error finding similar records with FTS: {str(e)}")
+        
+        # Fall back to basic search if FTS is unavailable or fails
+        return self._find_records_basic(text, collection, limit, include_content)
+    
+    def _find_records_fts(self, text: str, collection: str = None, limit: int = 10,
+                          include_content: bool = True) -> List[Dict]:
+        """
+        Full-text search implementation using the Kuzu FTS index.
+        """
+        columns = self._FTS_COLUMNS_WITH_CONTENT if include_content else self._FTS_COLUMNS
+        if collection:
+            query = self._FTS_QUERY_WITH_COLLECTION.format(columns=columns)
+            params = {'search_text': text, 'collection': collection, 'limit': limit}
+        elif self._fts_top:
+            query = self._FTS_QUERY_NO_COLLECTION.format(columns=columns)
+            params = {'search_text': text, 'limit': limit}
+        else:
+            query = self._FTS_QUERY_NO_COLLECTION_NO_TOP.format(columns=columns)
+            params = {'search_text': text, 'limit': limit}
+        
+        with self._read_conn() as conn:
+            try:
+                result = conn.execute(self._prepare(query, conn), params)
+            except RuntimeError as e:
+                if collection or not self._fts_top:
+                    raise
+                # Older FTS extensions reject TOP; search without it from now on
+                logger.warning(f"FTS search with TOP failed, retrying without it: {str(e)}")
+                query = self._FTS_QUERY_NO_COLLECTION_NO_TOP.format(columns=columns)
+                result = conn.execute(self._prepare(query, conn), params)
+                self._fts_top = False
+            rows = list(_iter_rows(result, limit))
+        
+        if include_content:
+            return [
+                {'uri': row[0], 'collection': row[1], 'score': row[2], 'value': _loads(row[3])}
+                for row in rows
+            ]
+        return [{'uri': row[0], 'collection': row[1], 'score': row[2]} for row in rows]
     
-    def _find_records_basic(self, text: str, collection: str = None, limit: int = 10) -> List[Dict]:
+    def _find_records_basic(self, text: str, collection: str = None, limit: int = 10,
+                            include_content: bool = True) -> List[Dict]:
         """
-        Basic search implementation that filters records in Python.
+        Basic search implementation using a case-insensitive substring match.
         Used as a fallback when FTS is not available.
         """
         try:
-            # Query to get records
+            # Filter inside Kuzu so only matching rows cross the driver boundary
+            columns = self._BASIC_COLUMNS_WITH_CONTENT if include_content else self._BASIC_COLUMNS
             if collection:
-                query = """
-                    MATCH (r:Record)
-                    WHERE r.collection = $collection
-                    RETURN r.uri as uri, r.content as content, r.collection as collection
-                    LIMIT $max_records
-                """
-                params = {'collection': collection, 'max_records': limit * 10}  # Get more to filter
+                query = self._BASIC_QUERY_WITH_COLLECTION.format(columns=columns)
+                params = {'collection': collection, 'needle': text.lower(), 'limit': limit}
             else:
-                query = """
-                    MATCH (r:Record)
-                    RETURN r.uri as uri, r.content as content, r.collection as collection
-                    LIMIT $max_records
-                """
-                params = {'max_records': limit * 10}  # Get more to filter
-            
-            result = self.conn.execute(query, params)
-            matches = []
-            
-            # Process in Python
-            while result.has_next():
-                row = result.get_next()
-                uri, content, collection = row
-                
-                # Check if content contains search text
-                content_obj = json.loads(content)
-                content_str = json.dumps(content_obj).lower()
-                
-                if text.lower() in content_str:
-                    matches.append({
-                        'uri': uri,
-                        'collection': collection,
-                        'value': content_obj
-                    })
-                    
-                    if len(matches) >= limit:
-                        break
+                query = self._BASIC_QUERY_NO_COLLECTION.format(columns=columns)
+                params = {'needle': text.lower(), 'limit': limit}
+            
+            with self._read_conn() as conn:
+                result = conn.execute(self._prepare(query, conn), params)
+                rows = list(_iter_rows(result, limit))
             
-            return matches
+            if include_content:
+                return [
+                    {'uri': row[0], 'collection': row[1], 'value': _loads(row[2])}
+                    for row in rows
+                ]
+            return [{'uri': row[0], 'collection': row[1]} for row in rows]
             
         except Exception as e:
             logger.error(f"Error in basic record search: {str(e)}")
             return []
 
-
 # Function to integrate with record_manager.py
-def mirror_record_to_db(record_manager, db_manager, collection: str, record: Dict, rkey: str = None, sphere_uri: str = None):
+def mirror_record_to_db(record_manager, db_manager, collection: str, record: Dict, rkey: str = None,
+                        sphere_uri: str = None, did: Optional[str] = None):
     """
     Mirror a record from ATProto to the database.
     
@@ -918,31 +1592,71 @@ def mirror_record_to_db(record_manager, db_manager, collection: str, record: Dic
         record: The record data
         rkey: The record key identifier (optional)
         sphere_uri: The URI of the sphere this record belongs to (optional)
+        did: The DID of the record's author; looked up from record_manager if omitted
+    """
+    uris = mirror_records_to_db(record_manager, db_manager, collection, [(record, rkey)],
+                                sphere_uri, did=did)
+    return uris[0] if uris else None
+
+
+def mirror_records_to_db(record_manager, db_manager, collection: str, records: List[tuple],
+                         sphere_uri: str = None, batch_size: int = MIRROR_BATCH_SIZE,
+                         did: Optional[str] = None) -> List[str]:
+    """
+    Mirror many records from ATProto to the database using bulk writes.
+    
+    Records are buffered and flushed to the database every batch_size records.
+    Call this inside db_manager.bulk_load() to write every batch in one transaction.
+    
+    Args:
+        record_manager: The RecordManager instance
+        db_manager: The DBManager instance
+        collection: The collection the records belong to
+        records: (record, rkey) pairs; rkey may be None if the record carries its uri
+        sphere_uri: The URI of the sphere these records belong to (optional)
+        batch_size: Number of records written per bulk query
+        did: The DID of the records' author; looked up from record_manager if omitted
+        
+    Returns:
+        The URIs of the mirrored records
     """
-    # Create the appropriate URI format
-    did = record_manager.client.me.did
-    if rkey is None:
-        # If rkey is not provided, it might be in the response from create_record
-        if hasattr(record, 'uri'):
-            uri = record.uri
-            cid = record.cid
+    if did is None:
+        did = record_manager.client.me.did
+    prefix = f"at://{did}/{collection}/"
+    uris = []
+    batch = []
+    
+    for record, rkey in records:
+        # Create the appropriate URI format
+        if rkey is None:
+            # If rkey is not provided, it might be in the response from create_record
+            if hasattr(record, 'uri'):
+                uri = record.uri
+                cid = record.cid
+            else:
+                # Handle case where we don't have an rkey
+                logger.warning("No rkey provided and record object doesn't have uri attribute")
+                continue
         else:
-            # Handle case where we don't have an rkey
-            logger.warning("No rkey provided and record object doesn't have uri attribute")
-            return None
-    else:
-        uri = f"at://{did}/{collection}/{rkey}"
-        cid = ""  # We might not have the CID in this case
-    
-    # Store in database
-    db_manager.store_record(
-        collection=collection,
-        record=record,
-        uri=uri,
-        cid=cid,
-        author_did=did,
-        rkey=rkey,
-        sphere_uri=sphere_uri
-    )
-    
-    return uri
\ No newline at end of file
+            uri = prefix + rkey
+            cid = ""  # We might not have the CID in this case
+        
+        batch.append({
+            'collection': collection,
+            'record': record,
+            'uri': uri,
+            'cid': cid,
+            'author_did': did,
+            'rkey': rkey,
+            'sphere_uri': sphere_uri
+        })
+        uris.append(uri)
+        
+        if len(batch) >= batch_size:
+            db_manager.store_records_bulk(batch)
+            batch = []
+    
+    if batch:
+        db_manager.store_records_bulk(batch)
+    
+    return uris
@@ -8,8 +8,11 @@ including syncing data from ATProto, querying records, and visualizing the graph
 import argparse
 import logging
 import os
+import queue
 import sys
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import json
 from datetime import datetime
 
@@ -23,7 +26,7 @@ from rich.console import Console
 from rich.syntax import Syntax
 
 from src.record_manager import RecordManager
-from src.db_manager import DBManager
+from src.db_manager import DBManager, MIRROR_BATCH_SIZE
 import src.session_reuse as session_reuse
 
 # Configure logging
@@ -38,6 +41,18 @@ logger = logging.getLogger("db_tools")
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
+# Number of JSON lines query_records prints per record
+MAX_DISPLAY_LINES = 40
+
+# Number of listed batches sync_from_atproto holds before listing waits for the database
+SYNC_QUEUE_SIZE = 16
+
+
+def _parse_aturi(uri: str) -> Tuple[str, str, str]:
+    """Split an at://did/collection/rkey URI into its DID, collection and record key."""
+    did, collection, rkey = uri[len("at://"):].split("/", 2)
+    return did, collection, rkey
+
 
 def sync_from_atproto(record_manager: RecordManager, db_manager: DBManager, collections: List[str] = None):
     """
@@ -65,58 +80,129 @@ def sync_from_atproto(record_manager: RecordManager, db_manager: DBManager, coll
     console.print(f"[bold green]Syncing data from ATProto to database[/bold green]")
     console.print(f"Collections to sync: {', '.join(collections)}")
     
-    with Progress() as progress:
+    # Every synced record is the logged-in user's, in the same sphere
+    did = record_manager.client.me.did
+    sphere_uri = record_manager.sphere_uri
+    
+    # Listing is network-bound, so page through every collection concurrently;
+    # the database writes stay on this thread, since a connection isn't thread-safe.
+    # The queue is bounded so listing can't run far ahead of the writes
+    batches = queue.Queue(maxsize=SYNC_QUEUE_SIZE)
+    stopped = threading.Event()
+    with Progress() as progress, ThreadPoolExecutor(max_workers=len(collections)) as executor:
+        tasks = {}
+        synced = {}
+        listers = []
         for collection in collections:
-            task = progress.add_task(f"Syncing {collection}...", total=None)
-            
-            try:
-                # Get records from ATProto
-                records = record_manager.list_records(collection)
-                progress.update(task, total=len(records))
-                progress.update(task, completed=0)
-                
-                # Sync each record to the database
-                for i, record in enumerate(records):
-                    try:
-                        # Extract record key and URI
-                        rkey = record.uri.split("/")[-1]
-                        uri = record.uri
-                        
-                        # Store in database
-                        db_manager.store_record(
-                            collection=collection,
-                            record=record.value,
-                            uri=uri,
-                            cid=record.cid if hasattr(record, 'cid') else "",
-                            author_did=record_manager.client.me.did,
-                            rkey=rkey,
-                            sphere_uri=record_manager.sphere_uri
-                        )
-                        
-                        # Update progress
-                        progress.update(task, completed=i+1)
-                        
-                    except Exception as e:
-                        logger.error(f"Error syncing record {record.uri}: {str(e)}")
-                        continue
-                
-                progress.update(task, completed=len(records))
+            tasks[collection] = progress.add_task(f"Syncing {collection}...", total=None)
+            synced[collection] = 0
+            listers.append(executor.submit(
+                _list_record_batches, record_manager, collection, did, sphere_uri, batches, stopped
+            ))
+        
+        try:
+            pending = len(collections)
+            while pending:
+                collection, batch, error = batches.get()
+                task = tasks[collection]
                 
-            except Exception as e:
-                logger.error(f"Error listing records in collection {collection}: {str(e)}")
-                progress.update(task, completed=1, total=1, description=f"[red]Failed: {collection}[/red]")
-                continue
+                if error is not None:
+                    logger.error(f"Error listing records in collection {collection}: {str(error)}")
+                    progress.update(task, completed=1, total=1, description=f"[red]Failed: {collection}[/red]")
+                    pending -= 1
+                elif batch is None:
+                    # The collection is exhausted, so its size is finally known
+                    progress.update(task, total=synced[collection], completed=synced[collection])
+                    pending -= 1
+                else:
+                    for uri, e in _store_batch(db_manager, batch):
+                        logger.error(f"Error syncing record {uri}: {str(e)}")
+                    synced[collection] += len(batch)
+                    progress.update(task, completed=synced[collection])
+        finally:
+            # If storing stopped early, stop the listers and unblock any waiting
+            # on the full queue, so the executor can shut down
+            stopped.set()
+            while not all(lister.done() for lister in listers):
+                try:
+                    batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
 
 
-def query_records(db_manager: DBManager, query_type: str, query_value: str, collection: str = None):
+def _store_batch(db_manager: DBManager, batch: List[Dict]) -> List[Tuple[str, Exception]]:
+    """
+    Store a batch of records, returning the URI and error of each record that failed.
+    
+    The batch is written in one bulk transaction. If that fails, its records are
+    retried one at a time so a single bad record doesn't lose the whole batch.
+    """
+    try:
+        db_manager.store_records_bulk(batch)
+        return []
+    except Exception as e:
+        logger.warning(f"Error storing a batch of {len(batch)} records, retrying them one at a time: {str(e)}")
+    
+    failures = []
+    for row in batch:
+        try:
+            db_manager.store_record(**row)
+        except Exception as e:
+            failures.append((row['uri'], e))
+    return failures
+
+
+def _list_record_batches(record_manager: RecordManager, collection: str, did: str,
+                         sphere_uri: Optional[str], batches: queue.Queue, stopped: threading.Event):
+    """
+    Page through a collection, putting store_records_bulk batches on a queue.
+    
+    Puts (collection, batch, None) for every MIRROR_BATCH_SIZE records, then
+    (collection, None, None) once the collection is exhausted, or
+    (collection, None, error) if listing fails. Returns early once stopped is set.
+    """
+    batch = []
+    try:
+        for record in record_manager.iter_records(collection):
+            if stopped.is_set():
+                return
+            
+            batch.append({
+                'collection': collection,
+                'record': record.value,
+                'uri': record.uri,
+                'cid': record.cid if hasattr(record, 'cid') else "",
+                'author_did': did,
+                'rkey': _parse_aturi(record.uri)[2],
+                'sphere_uri': sphere_uri
+            })
+            
+            if len(batch) >= MIRROR_BATCH_SIZE:
+                batches.put((collection, batch, None))
+                batch = []
+    except Exception as e:
+        batches.put((collection, None, e))
+        return
+    
+    if batch:
+        batches.put((collection, batch, None))
+    batches.put((collection, None, None))
+
+
+def query_records(db_manager: DBManager, query_type: str, query_value: str, collection: str = None,
+                  max_results: Optional[int] = None):
     """
     Query records from the database.
     
+    Results are printed as they are read, each truncated to MAX_DISPLAY_LINES
+    lines of JSON.
+    
     Args:
         db_manager: DBManager instance
         query_type: Type of query ('text', 'uri', 'collection')
         query_value: Value to query for
         collection: Collection to limit the search to (optional)
+        max_results: Maximum number of results to print (optional)
     """
     console = Console()
     console.print(f"[bold green]Querying records from database[/bold green]")
@@ -124,7 +210,10 @@ def query_records(db_manager: DBManager, query_type: str, query_value: str, coll
     results = []
     
     if query_type == "text":
-        results = db_manager.find_similar_records(query_value, collection)
+        if max_results is None:
+            results = db_manager.find_similar_records(query_value, collection)
+        else:
+            results = db_manager.find_similar_records(query_value, collection, limit=max_results)
         console.print(f"Found {len(results)} records matching text: '{query_value}'")
     
     elif query_type == "uri":
@@ -136,20 +225,36 @@ def query_records(db_manager: DBManager, query_type: str, query_value: str, coll
             console.print(f"[yellow]No record found with URI: {query_value}[/yellow]")
     
     elif query_type == "collection":
-        results = db_manager.list_records(query_value)
-        console.print(f"Found {len(results)} records in collection: {query_value}")
+        # Stream the collection rather than reading it all before printing
+        results = db_manager.iter_records(query_value)
     
     # Display results
+    shown = 0
     for result in results:
+        if shown == max_results:
+            break
+        
         uri = result.get("uri", "")
         value = result.get("value", {})
         
+        # Only highlight the lines that will be shown
+        lines = json.dumps(value, indent=2).splitlines()
+        if len(lines) > MAX_DISPLAY_LINES:
+            lines = lines[:MAX_DISPLAY_LINES] + [f"... ({len(lines) - MAX_DISPLAY_LINES} more lines)"]
+        
         # Create a panel for each result
         console.print(Panel(
-            Syntax(json.dumps(value, indent=2), "json", background_color="default"),
+            Syntax("\n".join(lines), "json", background_color="default"),
             title=f"[bold blue]{uri}[/bold blue]",
             expand=False
         ))
+        shown += 1
+    
+    if query_type == "collection":
+        if shown == max_results:
+            console.print(f"Showed the first {shown} records in collection: {query_value}")
+        else:
+            console.print(f"Found {shown} records in collection: {query_value}")
 
 
 def create_relationship(db_manager: DBManager, from_uri: str, to_uri: str, rel_type: str, strength: float = 1.0, note: str = None):
@@ -169,40 +274,16 @@ def create_relationship(db_manager: DBManager, from_uri: str, to_uri: str, rel_t
     
     try:
         # Check if both records exist
-        from_record = db_manager.get_record_by_uri(from_uri)
-        to_record = db_manager.get_record_by_uri(to_uri)
-        
-        if not from_record:
+        if not db_manager.record_exists(from_uri):
             console.print(f"[red]Source record not found: {from_uri}[/red]")
             return
         
-        if not to_record:
+        if not db_manager.record_exists(to_uri):
             console.print(f"[red]Target record not found: {to_uri}[/red]")
             return
         
-        # Create relationship record
-        relationship_record = {
-            "createdAt": datetime.now().isoformat(),
-            "relationship": rel_type,
-            "strength": strength,
-            "target": to_uri
-        }
-        
-        if note:
-            relationship_record["note"] = note
-        
         # Store in database
-        collection = "me.comind.relationship.link"
-        rkey = f"{from_uri.split('/')[-1]}-{to_uri.split('/')[-1]}"
-        
-        db_manager.store_record(
-            collection=collection,
-            record=relationship_record,
-            uri=f"at://{from_uri.split('/')[2]}/{collection}/{rkey}",
-            cid="",
-            author_did=from_uri.split('/')[2],
-            rkey=rkey
-        )
+        db_manager.store_record(**_relationship_row(from_uri, to_uri, rel_type, strength, note))
         
         console.print(f"[green]Created relationship from {from_uri} to {to_uri} with type {rel_type}[/green]")
         
@@ -210,6 +291,67 @@ def create_relationship(db_manager: DBManager, from_uri: str, to_uri: str, rel_t
         console.print(f"[red]Error creating relationship: {str(e)}[/red]")
 
 
+def create_relationships_bulk(db_manager: DBManager, relationships: List[Dict]) -> int:
+    """
+    Create many relationships between records with bulk writes.
+    
+    Relationships whose source or target record doesn't exist are skipped. A
+    relationship repeated between the same two records is stored once, with
+    the last values given.
+    
+    Args:
+        db_manager: DBManager instance
+        relationships: Dictionaries of create_relationship arguments (from_uri,
+            to_uri, rel_type, and optionally strength and note)
+            
+    Returns:
+        The number of relationships created
+    """
+    rows = []
+    for relationship in relationships:
+        from_uri = relationship['from_uri']
+        to_uri = relationship['to_uri']
+        if not (db_manager.record_exists(from_uri) and db_manager.record_exists(to_uri)):
+            logger.warning(f"Skipping relationship from {from_uri} to {to_uri}: record not found")
+            continue
+        
+        row = _relationship_row(from_uri, to_uri, relationship['rel_type'],
+                                relationship.get('strength', 1.0), relationship.get('note'))
+        rows.append(row)
+    
+    for start in range(0, len(rows), MIRROR_BATCH_SIZE):
+        db_manager.store_records_bulk(rows[start:start + MIRROR_BATCH_SIZE])
+    
+    # A repeated relationship overwrites the earlier one under the same URI
+    return len({row['uri'] for row in rows})
+
+
+def _relationship_row(from_uri: str, to_uri: str, rel_type: str, strength: float, note: Optional[str]) -> Dict:
+    """Build the store_record arguments for a link record from from_uri to to_uri."""
+    relationship_record = {
+        "createdAt": datetime.now().isoformat(),
+        "relationship": rel_type,
+        "strength": strength,
+        "target": to_uri
+    }
+    
+    if note:
+        relationship_record["note"] = note
+    
+    from_did, _, from_rkey = _parse_aturi(from_uri)
+    collection = "me.comind.relationship.link"
+    rkey = f"{from_rkey}-{_parse_aturi(to_uri)[2]}"
+    
+    return {
+        'collection': collection,
+        'record': relationship_record,
+        'uri': f"at://{from_did}/{collection}/{rkey}",
+        'cid': "",
+        'author_did': from_did,
+        'rkey': rkey
+    }
+
+
 def main():
     """Main function to run the database tools."""
     parser = argparse.ArgumentParser(description="Database tools for Comind project")
@@ -239,22 +381,30 @@ def main():
                              help="Value to query for")
     query_parser.add_argument("--collection", "-c", type=str,
                              help="Collection to limit the search to (optional)")
+    query_parser.add_argument("--max", "-m", dest="max_results", type=int,
+                             help="Maximum number of results to show (optional)")
     
     # Relationship command
     rel_parser = subparsers.add_parser("rel", help="Create a relationship between records")
-    rel_parser.add_argument("--from", dest="from_uri", type=str, required=True,
+    rel_parser.add_argument("--from", dest="from_uri", type=str,
                            help="URI of the source record")
-    rel_parser.add_argument("--to", dest="to_uri", type=str, required=True,
+    rel_parser.add_argument("--to", dest="to_uri", type=str,
                            help="URI of the target record")
-    rel_parser.add_argument("--type", "-t", type=str, required=True,
+    rel_parser.add_argument("--type", "-t", type=str,
                            help="Type of relationship")
     rel_parser.add_argument("--strength", "-s", type=float, default=1.0,
                            help="Strength of the relationship (0.0 to 1.0)")
     rel_parser.add_argument("--note", "-n", type=str,
                            help="Optional note about the relationship")
+    rel_parser.add_argument("--file", "-f", type=str,
+                           help="JSON file with a list of relationships to create in bulk, each "
+                                "with from_uri, to_uri, rel_type and optionally strength and note")
     
     args = parser.parse_args()
     
+    if args.command == "rel" and not args.file and not (args.from_uri and args.to_uri and args.type):
+        rel_parser.error("either --file or all of --from, --to and --type are required")
+    
     # Initialize database manager
     db_manager = DBManager(args.db_path)
     db_manager.setup_schema()
@@ -278,7 +428,14 @@ def main():
     
     elif args.command == "query":
         # Query records
-        query_records(db_manager, args.type, args.value, args.collection)
+        query_records(db_manager, args.type, args.value, args.collection, args.max_results)
+    
+    elif args.command == "rel" and args.file:
+        # Create relationships in bulk
+        with open(args.file) as f:
+            relationships = json.load(f)
+        created = create_relationships_bulk(db_manager, relationships)
+        print(f"[green]Created {created} of {len(relationships)} relationships[/green]")
     
     elif args.command == "rel":
         # Create relationship
@@ -6,9 +6,12 @@ and analysis of the Comind knowledge network.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Any
 
 from neo4j import GraphDatabase
+from neo4j.exceptions import DriverError, Neo4jError
 
 # Configure logging
 logging.basicConfig(
@@ -17,6 +20,216 @@ logging.basicConfig(
 )
 logger = logging.getLogger("graph_sync")
 
+# Number of records written per UNWIND query when syncing a collection
+SYNC_BATCH_SIZE = 1000
+
+# Number of collections sync_all_records syncs at once
+SYNC_WORKERS = 8
+
+# Maximum number of concept texts remembered for concept relationships
+CONCEPT_TEXT_CACHE_SIZE = 50_000
+
+# Marks a concept whose text hasn't been fetched, as None is a valid result
+_MISSING = object()
+
+_REPO_QUERY = """
+MERGE (r:Repo {did: $did})
+ON CREATE SET r.createdAt = datetime()
+ON MATCH SET r.updatedAt = datetime()
+"""
+
+_REPO_WITH_HANDLE_QUERY = _REPO_QUERY + "SET r.handle = $handle\n"
+
+# Upserts for each collection, run over a list of rows built by the matching
+# GraphSyncService._*_row method. Queries for records owned by a Repo take the
+# rows grouped by DID, so each Repo is upserted once per batch. An existing Repo
+# isn't written to, so collections syncing in parallel for the same DID don't
+# serialize on its write lock for the length of their batch transactions
+_CONCEPT_BATCH_QUERY = """
+UNWIND $groups AS g
+MERGE (repo:Repo {did: g.did})
+ON CREATE SET repo.createdAt = datetime()
+WITH repo, g
+UNWIND g.rows AS row
+MERGE (c:Concept {uri: row.uri})
+SET c.cid = row.cid,
+    c.text = row.text,
+    c.createdAt = row.createdAt,
+    c.updatedAt = datetime()
+MERGE (repo)-[r:OWNS]->(c)
+ON CREATE SET r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.updatedAt = datetime()
+"""
+
+_THOUGHT_BATCH_QUERY = """
+UNWIND $groups AS g
+MERGE (repo:Repo {did: g.did})
+ON CREATE SET repo.createdAt = datetime()
+WITH repo, g
+UNWIND g.rows AS row
+MERGE (t:Thought {uri: row.uri})
+SET t.cid = row.cid,
+    t.text = row.text,
+    t.thoughtType = row.thoughtType,
+    t.context = row.context,
+    t.confidence = row.confidence,
+    t.createdAt = row.createdAt,
+    t.updatedAt = datetime()
+MERGE (repo)-[r:OWNS]->(t)
+ON CREATE SET r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.updatedAt = datetime()
+"""
+
+_EMOTION_BATCH_QUERY = """
+UNWIND $groups AS g
+MERGE (repo:Repo {did: g.did})
+ON CREATE SET repo.createdAt = datetime()
+WITH repo, g
+UNWIND g.rows AS row
+MERGE (e:Emotion {uri: row.uri})
+SET e.cid = row.cid,
+    e.text = row.text,
+    e.emotionType = row.emotionType,
+    e.createdAt = row.createdAt,
+    e.updatedAt = datetime()
+MERGE (repo)-[r:OWNS]->(e)
+ON CREATE SET r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.updatedAt = datetime()
+"""
+
+_SPHERE_BATCH_QUERY = """
+UNWIND $groups AS g
+MERGE (repo:Repo {did: g.did})
+ON CREATE SET repo.createdAt = datetime()
+WITH repo, g
+UNWIND g.rows AS row
+MERGE (s:Sphere {uri: row.uri})
+SET s.cid = row.cid,
+    s.title = row.title,
+    s.text = row.text,
+    s.description = row.description,
+    s.createdAt = row.createdAt,
+    s.updatedAt = datetime()
+MERGE (repo)-[r:OWNS]->(s)
+ON CREATE SET r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.updatedAt = datetime()
+"""
+
+# Collections whose batch queries take $groups rather than $rows
+_REPO_OWNED_COLLECTIONS = frozenset({
+    "me.comind.concept",
+    "me.comind.thought",
+    "me.comind.emotion",
+    "me.comind.sphere.core",
+})
+
+_POST_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Post {uri: row.uri})
+SET p.cid = row.cid,
+    p.text = row.text,
+    p.createdAt = row.createdAt,
+    p.updatedAt = datetime()
+"""
+
+# The concept's text is only overwritten when it could be fetched
+_CONCEPT_RELATION_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (source {uri: row.source_uri})
+ON CREATE SET source.createdAt = datetime()
+MERGE (target:Concept {uri: row.target_uri})
+ON CREATE SET target.createdAt = datetime()
+SET target.text = coalesce(row.concept_text, target.text)
+MERGE (source)-[r:CONCEPT_RELATION {uri: row.uri}]->(target)
+ON CREATE SET r.cid = row.cid,
+              r.relationship = row.relationship,
+              r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.cid = row.cid,
+             r.relationship = row.relationship,
+             r.updatedAt = datetime()
+"""
+
+_LINK_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (source {uri: row.source_uri})
+ON CREATE SET source.createdAt = datetime()
+MERGE (target {uri: row.target_uri})
+ON CREATE SET target.createdAt = datetime()
+MERGE (source)-[r:LINK {uri: row.uri}]->(target)
+ON CREATE SET r.cid = row.cid,
+              r.relationship = row.relationship,
+              r.strength = row.strength,
+              r.note = row.note,
+              r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.cid = row.cid,
+             r.relationship = row.relationship,
+             r.strength = row.strength,
+             r.note = row.note,
+             r.updatedAt = datetime()
+"""
+
+_IN_SPHERE_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (target {uri: row.target_uri})
+ON CREATE SET target.createdAt = datetime()
+MERGE (sphere:Sphere {uri: row.sphere_uri})
+ON CREATE SET sphere.createdAt = datetime()
+MERGE (target)-[r:IN_SPHERE {uri: row.uri}]->(sphere)
+ON CREATE SET r.cid = row.cid,
+              r.createdAt = row.createdAt,
+              r.updatedAt = datetime()
+ON MATCH SET r.cid = row.cid,
+             r.updatedAt = datetime()
+"""
+
+
+def _extract_did_from_uri(uri: str) -> Optional[str]:
+    """Extract the DID from an ATProto URI."""
+    # URI format: at://did:plc:example/collection/rkey
+    if not uri.startswith("at://did:"):
+        return None
+    end = uri.find("/", len("at://"))
+    return uri[len("at://"):end] if end != -1 else uri[len("at://"):]
+
+
+def _value_dict(value: Any) -> Dict:
+    """Convert an ATProto record value to the plain dict the row builders read."""
+    if isinstance(value, dict):
+        return value
+    # Values outside the official lexicons (all of Comind's) are DotDicts
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    # Lexicon models; dump by alias to keep the record's own field names
+    return value.model_dump(by_alias=True)
+
+
+def _concept_text(value: Any) -> Optional[str]:
+    """Get the text of a concept record's value, or None if it has none."""
+    # Values outside the official lexicons are DotDicts, whose attributes
+    # (including get) look up fields; test and index instead
+    if not value or "concept" not in value:
+        return None
+    return value["concept"]
+
+
+def _group_by_did(rows: List[Dict]) -> List[Dict]:
+    """Group rows by their owner's DID, as {"did": ..., "rows": [...]} dicts."""
+    groups: Dict[str, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault(row["did"], []).append(row)
+    return [{"did": did, "rows": group} for did, group in groups.items()]
+
+
+def _run_batch(tx, query: str, params: Dict):
+    """Run a batch query inside a managed transaction."""
+    tx.run(query, params).consume()
+
 
 class GraphSyncService:
     """
@@ -63,6 +276,29 @@ class GraphSyncService:
             record_manager: Authenticated RecordManager instance (optional)
         """
         self.record_manager = record_manager
+
+        # Concept texts fetched for concept relationships, keyed by concept URI;
+        # a concept is typically the target of many relationships
+        self._concept_texts = OrderedDict()
+
+        # Batch query and row builder for each collection that can be synced
+        self._writers = {
+            "me.comind.concept": (_CONCEPT_BATCH_QUERY, self._concept_row),
+            "me.comind.thought": (_THOUGHT_BATCH_QUERY, self._thought_row),
+            "me.comind.emotion": (_EMOTION_BATCH_QUERY, self._emotion_row),
+            "me.comind.sphere.core": (_SPHERE_BATCH_QUERY, self._sphere_row),
+            "me.comind.relationship.concept": (
+                _CONCEPT_RELATION_BATCH_QUERY,
+                self._concept_relationship_row,
+            ),
+            "me.comind.relationship.link": (_LINK_BATCH_QUERY, self._link_relationship_row),
+            "me.comind.relationship.sphere": (
+                _IN_SPHERE_BATCH_QUERY,
+                self._sphere_relationship_row,
+            ),
+            "app.bsky.feed.post": (_POST_BATCH_QUERY, self._post_row),
+        }
+
         self.driver = GraphDatabase.driver(
             neo4j_uri, auth=(neo4j_user, neo4j_password)
         )
@@ -129,15 +365,35 @@ class GraphSyncService:
         if include_external:
             collections_to_sync.extend(self.EXTERNAL_COLLECTIONS)
 
+        # Relationship queries MERGE their endpoints by uri alone, so sync the
+        # labeled nodes first to avoid creating unlabeled duplicates
+        node_collections = [
+            c for c in collections_to_sync
+            if not c.startswith("me.comind.relationship.")
+        ]
+        relationship_collections = [
+            c for c in collections_to_sync
+            if c.startswith("me.comind.relationship.")
+        ]
+
         total_synced = 0
 
-        for collection in collections_to_sync:
-            try:
-                synced_count = self.sync_collection(collection)
-                total_synced += synced_count
-                logger.info(f"Synced {synced_count} records from {collection}")
-            except Exception as e:
-                logger.error(f"Failed to sync collection {collection}: {e}")
+        # Syncing is mostly waiting on ATProto and Bolt, so collections in the
+        # same phase run concurrently, each on its own session
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as executor:
+            for phase in (node_collections, relationship_collections):
+                futures = {
+                    executor.submit(self.sync_collection, collection): collection
+                    for collection in phase
+                }
+                for future in as_completed(futures):
+                    collection = futures[future]
+                    try:
+                        synced_count = future.result()
+                        total_synced += synced_count
+                        logger.info(f"Synced {synced_count} records from {collection}")
+                    except Exception as e:
+                        logger.error(f"Failed to sync collection {collection}: {e}")
 
         logger.info(
             f"Full sync complete. Total records synced: {total_synced}"
@@ -148,6 +404,8 @@ class GraphSyncService:
         """
         Sync all records from a specific collection.
 
+        Records are written SYNC_BATCH_SIZE at a time, one query per batch.
+
         Args:
             collection: The collection NSID to sync
 
@@ -156,37 +414,107 @@ class GraphSyncService:
         """
         logger.info(f"Syncing collection: {collection}")
 
+        if collection not in self._writers:
+            logger.warning(f"Unknown collection type: {collection}")
+            return 0
+
+        if collection == "me.comind.relationship.concept":
+            self._prefetch_concept_texts()
+
         try:
-            # Use list_all_records to handle pagination
-            records = self.record_manager.list_all_records(collection)
+            # Stream the records a page at a time, so the first batch is written
+            # before the whole collection has been listed. One session serves the
+            # whole collection, with a transaction per batch
+            records = self.record_manager.iter_records(collection)
+            with self.driver.session() as session:
+                synced_count = self._sync_records(records, collection, session)
+
+        except Exception as e:
+            logger.error(f"Failed to sync collection {collection}: {e}")
+            raise
 
-            if not records:
-                logger.info(f"No records found in collection: {collection}")
-                return 0
+        if not synced_count:
+            logger.info(f"No records synced from collection: {collection}")
+        return synced_count
 
-            logger.info(f"Found {len(records)} records in collection: {collection}")
-            synced_count = 0
+    def _sync_records(self, records: Iterable[Any], collection: str, session) -> int:
+        """Write records to Neo4j in batches on a session, returning how many were synced."""
+        synced_count = 0
+        batch = []
 
-            for record in records:
-                try:
-                    self.sync_record(record, collection)
-                    synced_count += 1
-                except Exception as e:
-                    import traceback
+        for record in records:
+            try:
+                row = self._record_row(record, collection)
+            except Exception as e:
+                import traceback
 
-                    logger.error(f"Failed to sync record {record.uri}: {e}")
-                    logger.error(f"Full traceback: {traceback.format_exc()}")
-                    # Also debug the record structure
-                    logger.error(f"Record type: {type(record)}")
-                    logger.error(f"Record attributes: {dir(record)}")
+                logger.error(f"Failed to sync record {record.uri}: {e}")
+                logger.error(f"Full traceback: {traceback.format_exc()}")
+                # Also debug the record structure
+                logger.error(f"Record type: {type(record)}")
+                logger.error(f"Record attributes: {dir(record)}")
+                continue
 
-            return synced_count
+            if row is not None:
+                batch.append(row)
+            if len(batch) >= SYNC_BATCH_SIZE:
+                synced_count += self._flush_batch(collection, batch, session)
+                batch = []
+                logger.info(f"Synced {synced_count} records from {collection} so far")
+
+        if batch:
+            synced_count += self._flush_batch(collection, batch, session)
+
+        return synced_count
+
+    def _flush_batch(self, collection: str, rows: List[Dict], session) -> int:
+        """
+        Write a batch of rows, returning how many were synced.
 
+        If the batch fails, its rows are retried one at a time so that a
+        single bad row doesn't drop the rest of the batch. Errors the driver
+        retries itself, such as an unavailable server, are raised instead:
+        they have already outlasted its retries and would fail every row too.
+        """
+        try:
+            self._write_rows(collection, rows, session)
+            return len(rows)
         except Exception as e:
-            logger.error(
-                f"Failed to list records in collection {collection}: {e}"
+            if isinstance(e, (DriverError, Neo4jError)) and e.is_retryable():
+                raise
+            logger.warning(
+                f"Failed to sync {len(rows)} records from {collection} as a batch, "
+                f"retrying them one at a time: {e}"
             )
-            raise
+
+        synced_count = 0
+        for row in rows:
+            try:
+                self._write_rows(collection, [row], session)
+                synced_count += 1
+            except Exception as e:
+                logger.error(f"Failed to sync record {row['uri']}: {e}")
+        return synced_count
+
+    def _write_rows(self, collection: str, rows: List[Dict], session=None):
+        """
+        Upsert rows built for a collection with its batch query.
+
+        The rows are written in one transaction, which the driver retries on
+        transient errors. A new session is opened unless one is given.
+        """
+        query, _ = self._writers[collection]
+        if collection in _REPO_OWNED_COLLECTIONS:
+            params = {"groups": _group_by_did(rows)}
+        else:
+            params = {"rows": rows}
+
+        if session is not None:
+            session.execute_write(_run_batch, query, params)
+            return
+
+        with self.driver.session() as session:
+            session.execute_write(_run_batch, query, params)
 
     def sync_record(self, record: Any, collection: str):
         """
@@ -196,22 +524,30 @@ class GraphSyncService:
             record: ATProto record object
             collection: The collection this record belongs to
         """
-        # Convert pydantic record to dict
-        record_dict = record.model_dump()
+        if collection not in self._writers:
+            logger.warning(f"Unknown collection type: {collection}")
+            return
 
-        # Extract basic properties
-        uri = record_dict.get("uri")
-        cid = record_dict.get("cid")
-        value = record_dict.get("value")
+        row = self._record_row(record, collection)
+        if row is not None:
+            self._write_rows(collection, [row])
+
+    def _record_row(self, record: Any, collection: str) -> Optional[Dict]:
+        """Build the batch row for an ATProto record, or None if it is incomplete."""
+        # Read the basic properties directly rather than dumping the whole record
+        uri = getattr(record, "uri", None)
+        cid = getattr(record, "cid", None)
+        value = getattr(record, "value", None)
 
         # Check for None values
         if uri is None or cid is None or value is None:
             logger.error(
                 f"Record has None attributes: uri={uri}, cid={cid}, value={value}"
             )
-            return
+            return None
 
-        self.sync_record_data(uri, cid, value, collection)
+        _, build_row = self._writers[collection]
+        return build_row(uri, cid, _value_dict(value))
 
     def sync_record_data(
         self, uri: str, cid: str, value: Dict, collection: str
@@ -232,57 +568,23 @@ class GraphSyncService:
             )
             return
 
-        # Note: Repo nodes and OWNS relationships are now handled directly
-        # in the individual node creation methods to prevent duplicate nodes
-
-        # Determine record type and create appropriate node
-        if collection == "me.comind.concept":
-            self._create_concept_node(uri, cid, value)
-        elif collection == "me.comind.thought":
-            self._create_thought_node(uri, cid, value)
-        elif collection == "me.comind.emotion":
-            self._create_emotion_node(uri, cid, value)
-        elif collection == "me.comind.sphere.core":
-            self._create_sphere_node(uri, cid, value)
-        elif collection == "me.comind.relationship.concept":
-            self._create_concept_relationship(uri, cid, value)
-        elif collection == "me.comind.relationship.link":
-            self._create_link_relationship(uri, cid, value)
-        elif collection == "me.comind.relationship.sphere":
-            self._create_sphere_relationship(uri, cid, value)
-        elif collection == "app.bsky.feed.post":
-            self._create_post_node(uri, cid, value)
-        else:
+        # Note: Repo nodes and OWNS relationships are handled by the node
+        # queries themselves to prevent duplicate nodes
+        if collection not in self._writers:
             logger.warning(f"Unknown collection type: {collection}")
+            return
 
-    def _extract_did_from_uri(self, uri: str) -> Optional[str]:
-        """Extract the DID from an ATProto URI."""
-        try:
-            # URI format: at://did:plc:example/collection/rkey
-            parts = uri.split("/")
-            if (
-                len(parts) >= 3
-                and parts[0] == "at:"
-                and parts[2].startswith("did:")
-            ):
-                return parts[2]
-            return None
-        except Exception as e:
-            logger.warning(f"Failed to extract DID from URI {uri}: {e}")
-            return None
+        _, build_row = self._writers[collection]
+        self._write_rows(collection, [build_row(uri, cid, value)])
 
     def _ensure_repo_node(self, did: str, handle: str = None):
         """Ensure a Repo node exists for the given DID."""
-        query = """
-        MERGE (r:Repo {did: $did})
-        ON CREATE SET r.createdAt = datetime()
-        ON MATCH SET r.updatedAt = datetime()
-        """
-
-        params = {"did": did}
         if handle:
-            query += " SET r.handle = $handle"
-            params["handle"] = handle
+            query = _REPO_WITH_HANDLE_QUERY
+            params = {"did": did, "handle": handle}
+        else:
+            query = _REPO_QUERY
+            params = {"did": did}
 
         with self.driver.session() as session:
             session.run(query, params)
@@ -291,324 +593,176 @@ class GraphSyncService:
         self, did: str, record_uri: str, record_cid: str, created_at: str
     ):
         """Create an OWNS relationship between a Repo and a record."""
-        # Note: We don't create the record node here anymore since it will be created
-        # with proper labels by the specific node creation methods (_create_concept_node, etc.)
-        # We'll establish the OWNS relationship later if needed
+        # Note: We don't create the record node here anymore since the batch
+        # queries (_CONCEPT_BATCH_QUERY, etc.) create it with its proper label
+        # and merge the OWNS relationship along with it
         pass
 
-    def _create_concept_node(self, uri: str, cid: str, value: Dict):
-        """Create a Concept node in Neo4j."""
-        # Extract DID from URI for OWNS relationship
-        did = self._extract_did_from_uri(uri)
-        created_at = value.get("createdAt", "")
-
-        query = """
-        MERGE (repo:Repo {did: $did})
-        ON CREATE SET repo.createdAt = datetime()
-        ON MATCH SET repo.updatedAt = datetime()
-        MERGE (c:Concept {uri: $uri})
-        SET c.cid = $cid,
-            c.text = $text,
-            c.createdAt = $created_at,
-            c.updatedAt = datetime()
-        MERGE (repo)-[r:OWNS]->(c)
-        ON CREATE SET r.createdAt = $created_at,
-                      r.updatedAt = datetime()
-        ON MATCH SET r.updatedAt = datetime()
-        """
-
-        with self.driver.session() as session:
-            session.run(
-                query,
-                did=did,
-                uri=uri,
-                cid=cid,
-                text=value.get("concept", ""),
-                created_at=created_at,
-            )
-
-    def _create_thought_node(self, uri: str, cid: str, value: Dict):
-        """Create a Thought node in Neo4j."""
+    def _concept_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a Concept node."""
+        return {
+            # Extract DID from URI for OWNS relationship
+            "did": _extract_did_from_uri(uri),
+            "uri": uri,
+            "cid": cid,
+            "text": value.get("concept", ""),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _thought_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a Thought node."""
         generated = value.get("generated", {})
-        did = self._extract_did_from_uri(uri)
-        created_at = value.get("createdAt", "")
-
-        query = """
-        MERGE (repo:Repo {did: $did})
-        ON CREATE SET repo.createdAt = datetime()
-        ON MATCH SET repo.updatedAt = datetime()
-        MERGE (t:Thought {uri: $uri})
-        SET t.cid = $cid,
-            t.text = $text,
-            t.thoughtType = $thoughtType,
-            t.context = $context,
-            t.confidence = $confidence,
-            t.createdAt = $createdAt,
-            t.updatedAt = datetime()
-        MERGE (repo)-[r:OWNS]->(t)
-        ON CREATE SET r.createdAt = $createdAt,
-                      r.updatedAt = datetime()
-        ON MATCH SET r.updatedAt = datetime()
-        """
-
-        with self.driver.session() as session:
-            session.run(
-                query,
-                did=did,
-                uri=uri,
-                cid=cid,
-                text=generated.get("text", ""),
-                thoughtType=generated.get("thoughtType", ""),
-                context=generated.get("context", ""),
-                confidence=generated.get("confidence"),
-                createdAt=created_at,
-            )
-
-    def _create_emotion_node(self, uri: str, cid: str, value: Dict):
-        """Create an Emotion node in Neo4j."""
+        return {
+            "did": _extract_did_from_uri(uri),
+            "uri": uri,
+            "cid": cid,
+            "text": generated.get("text", ""),
+            "thoughtType": generated.get("thoughtType", ""),
+            "context": generated.get("context", ""),
+            "confidence": generated.get("confidence"),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _emotion_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for an Emotion node."""
         generated = value.get("generated", {})
-        did = self._extract_did_from_uri(uri)
-        created_at = value.get("createdAt", "")
-
-        query = """
-        MERGE (repo:Repo {did: $did})
-        ON CREATE SET repo.createdAt = datetime()
-        ON MATCH SET repo.updatedAt = datetime()
-        MERGE (e:Emotion {uri: $uri})
-        SET e.cid = $cid,
-            e.text = $text,
-            e.emotionType = $emotionType,
-            e.createdAt = $createdAt,
-            e.updatedAt = datetime()
-        MERGE (repo)-[r:OWNS]->(e)
-        ON CREATE SET r.createdAt = $createdAt,
-                      r.updatedAt = datetime()
-        ON MATCH SET r.updatedAt = datetime()
-        """
-
-        with self.driver.session() as session:
-            session.run(
-                query,
-                did=did,
-                uri=uri,
-                cid=cid,
-                text=generated.get("text", ""),
-                emotionType=generated.get("emotionType", ""),
-                createdAt=created_at,
-            )
-
-    def _create_sphere_node(self, uri: str, cid: str, value: Dict):
-        """Create a Sphere node in Neo4j."""
-        did = self._extract_did_from_uri(uri)
-        created_at = value.get("createdAt", "")
-
-        query = """
-        MERGE (repo:Repo {did: $did})
-        ON CREATE SET repo.createdAt = datetime()
-        ON MATCH SET repo.updatedAt = datetime()
-        MERGE (s:Sphere {uri: $uri})
-        SET s.cid = $cid,
-            s.title = $title,
-            s.text = $text,
-            s.description = $description,
-            s.createdAt = $createdAt,
-            s.updatedAt = datetime()
-        MERGE (repo)-[r:OWNS]->(s)
-        ON CREATE SET r.createdAt = $createdAt,
-                      r.updatedAt = datetime()
-        ON MATCH SET r.updatedAt = datetime()
-        """
-
-        with self.driver.session() as session:
-            session.run(
-                query,
-                did=did,
-                uri=uri,
-                cid=cid,
-                title=value.get("title", ""),
-                text=value.get("text", ""),
-                description=value.get("description", ""),
-                createdAt=created_at,
-            )
-
-    def _create_post_node(self, uri: str, cid: str, value: Dict):
-        """Create a Post node in Neo4j."""
-        query = """
-        MERGE (p:Post {uri: $uri})
-        SET p.cid = $cid,
-            p.text = $text,
-            p.createdAt = $createdAt,
-            p.updatedAt = datetime()
-        """
-
-        with self.driver.session() as session:
-            session.run(
-                query,
-                uri=uri,
-                cid=cid,
-                text=value.get("text", ""),
-                createdAt=value.get("createdAt", ""),
-            )
-
-    def _create_concept_relationship(self, uri: str, cid: str, value: Dict):
-        """Create a relationship between source and concept."""
-        source_uri = value.get("source", "")
+        return {
+            "did": _extract_did_from_uri(uri),
+            "uri": uri,
+            "cid": cid,
+            "text": generated.get("text", ""),
+            "emotionType": generated.get("emotionType", ""),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _sphere_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a Sphere node."""
+        return {
+            "did": _extract_did_from_uri(uri),
+            "uri": uri,
+            "cid": cid,
+            "title": value.get("title", ""),
+            "text": value.get("text", ""),
+            "description": value.get("description", ""),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _post_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a Post node."""
+        return {
+            "uri": uri,
+            "cid": cid,
+            "text": value.get("text", ""),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _concept_relationship_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a relationship between source and concept."""
         target_uri = value.get("target", "")
-        relationship_type = value.get("relationship", "RELATES_TO")
 
-        # First, check if the concept exists and has text
-        # If not, try to fetch it from the repository
+        # The relationship only references the concept, so fetch its text from
+        # the repository to make sure the Concept node has it
+        concept_text = self._fetch_concept_text(target_uri) if target_uri else None
+
+        return {
+            "uri": uri,
+            "cid": cid,
+            "source_uri": value.get("source", ""),
+            "target_uri": target_uri,
+            "concept_text": concept_text or None,
+            "relationship": value.get("relationship", "RELATES_TO"),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _fetch_concept_text(self, concept_uri: str) -> Optional[str]:
+        """Fetch a concept's text from the repository, remembering the result."""
+        concept_text = self._concept_texts.get(concept_uri, _MISSING)
+        if concept_text is not _MISSING:
+            self._concept_texts.move_to_end(concept_uri)
+            return concept_text
+
         concept_text = None
-        if self.record_manager and target_uri:
+        if self.record_manager:
             try:
                 # Parse the URI to get collection and rkey
-                parts = target_uri.split('/')
-                if len(parts) >= 5 and target_uri.startswith('at://'):
+                parts = concept_uri.split('/')
+                if len(parts) >= 5 and concept_uri.startswith('at://'):
                     repo = parts[2]
                     collection = parts[3]
                     rkey = '/'.join(parts[4:])
-                    
+
                     # Fetch the concept record
                     concept_record = self.record_manager.client.com.atproto.repo.get_record({
                         'collection': collection,
                         'repo': repo,
                         'rkey': rkey
                     })
-                    
-                    if concept_record and concept_record.value:
-                        concept_text = concept_record.value.get('concept', None)
-                        logger.debug(f"Fetched concept text for {target_uri}: {concept_text}")
+
+                    if concept_record:
+                        concept_text = _concept_text(concept_record.value)
+                        logger.debug(f"Fetched concept text for {concept_uri}: {concept_text}")
             except Exception as e:
-                logger.warning(f"Failed to fetch concept record {target_uri}: {e}")
-
-        # Create the relationship, ensuring the concept has its text if we found it
-        if concept_text:
-            query = """
-            MERGE (source {uri: $source_uri})
-            ON CREATE SET source.createdAt = datetime()
-            MERGE (target:Concept {uri: $target_uri})
-            ON CREATE SET target.createdAt = datetime()
-            SET target.text = $concept_text
-            MERGE (source)-[r:CONCEPT_RELATION {uri: $uri}]->(target)
-            ON CREATE SET r.cid = $cid,
-                          r.relationship = $relationship,
-                          r.createdAt = $createdAt,
-                          r.updatedAt = datetime()
-            ON MATCH SET r.cid = $cid,
-                         r.relationship = $relationship,
-                         r.updatedAt = datetime()
-            """
-            params = {
-                "uri": uri,
-                "cid": cid,
-                "source_uri": source_uri,
-                "target_uri": target_uri,
-                "concept_text": concept_text,
-                "relationship": relationship_type,
-                "createdAt": value.get("createdAt", ""),
-            }
-        else:
-            # Fall back to original query without setting text
-            query = """
-            MERGE (source {uri: $source_uri})
-            ON CREATE SET source.createdAt = datetime()
-            MERGE (target:Concept {uri: $target_uri})
-            ON CREATE SET target.createdAt = datetime()
-            MERGE (source)-[r:CONCEPT_RELATION {uri: $uri}]->(target)
-            ON CREATE SET r.cid = $cid,
-                          r.relationship = $relationship,
-                          r.createdAt = $createdAt,
-                          r.updatedAt = datetime()
-            ON MATCH SET r.cid = $cid,
-                         r.relationship = $relationship,
-                         r.updatedAt = datetime()
-            """
-            params = {
-                "uri": uri,
-                "cid": cid,
-                "source_uri": source_uri,
-                "target_uri": target_uri,
-                "relationship": relationship_type,
-                "createdAt": value.get("createdAt", ""),
-            }
+                # Leave the concept uncached so a later relationship retries it
+                logger.warning(f"Failed to fetch concept record {concept_uri}: {e}")
+                return None
 
-        with self.driver.session() as session:
-            session.run(query, **params)
+        self._remember_concept_text(concept_uri, concept_text)
+        return concept_text
 
-    def _create_link_relationship(self, uri: str, cid: str, value: Dict):
-        """Create a general link relationship between nodes."""
-        source = value.get("source", {})
-        source_uri = (
-            source.get("uri", "") if isinstance(source, dict) else source
-        )
-        target_uri = value.get("target", "")
-        generated = value.get("generated", {})
-        relationship_type = generated.get("relationship", "LINKS_TO")
+    def _prefetch_concept_texts(self):
+        """
+        Cache the text of every concept in the repository.
 
-        query = """
-        MERGE (source {uri: $source_uri})
-        ON CREATE SET source.createdAt = datetime()
-        MERGE (target {uri: $target_uri})
-        ON CREATE SET target.createdAt = datetime()
-        MERGE (source)-[r:LINK {uri: $uri}]->(target)
-        ON CREATE SET r.cid = $cid,
-                      r.relationship = $relationship,
-                      r.strength = $strength,
-                      r.note = $note,
-                      r.createdAt = $createdAt,
-                      r.updatedAt = datetime()
-        ON MATCH SET r.cid = $cid,
-                     r.relationship = $relationship,
-                     r.strength = $strength,
-                     r.note = $note,
-                     r.updatedAt = datetime()
+        Listing the concept collection takes one request per page, where
+        fetching the targets of concept relationships takes one per concept.
+        Concepts in other repositories are still fetched individually.
         """
+        try:
+            for concept in self.record_manager.iter_records("me.comind.concept"):
+                # A concept without text is cached too, so it isn't fetched again
+                self._remember_concept_text(concept.uri, _concept_text(concept.value))
+        except Exception as e:
+            logger.warning(f"Failed to prefetch concept texts: {e}")
 
-        with self.driver.session() as session:
-            session.run(
-                query,
-                uri=uri,
-                cid=cid,
-                source_uri=source_uri,
-                target_uri=target_uri,
-                relationship=relationship_type,
-                strength=generated.get("strength"),
-                note=generated.get("note", ""),
-                createdAt=value.get("createdAt", ""),
-            )
+    def _remember_concept_text(self, concept_uri: str, concept_text: Optional[str]):
+        """Cache a concept's text (or None), evicting the oldest entry when full."""
+        self._concept_texts[concept_uri] = concept_text
+        self._concept_texts.move_to_end(concept_uri)
+        if len(self._concept_texts) > CONCEPT_TEXT_CACHE_SIZE:
+            self._concept_texts.popitem(last=False)
 
-    def _create_sphere_relationship(self, uri: str, cid: str, value: Dict):
-        """Create a relationship between content and sphere."""
+    def _link_relationship_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a general link relationship between nodes."""
+        source = value.get("source", {})
+        generated = value.get("generated", {})
+        return {
+            "uri": uri,
+            "cid": cid,
+            "source_uri": (
+                source.get("uri", "") if isinstance(source, dict) else source
+            ),
+            "target_uri": value.get("target", ""),
+            "relationship": generated.get("relationship", "LINKS_TO"),
+            "strength": generated.get("strength"),
+            "note": generated.get("note", ""),
+            "createdAt": value.get("createdAt", ""),
+        }
+
+    def _sphere_relationship_row(self, uri: str, cid: str, value: Dict) -> Dict:
+        """Build the batch row for a relationship between content and sphere."""
         target = value.get("target", "")
         # Handle strongRef format (object with uri and cid) or plain string
         if isinstance(target, dict):
             target_uri = target.get("uri", "")
         else:
             target_uri = target
-        sphere_uri = value.get("sphere_uri", "")
-
-        query = """
-        MERGE (target {uri: $target_uri})
-        ON CREATE SET target.createdAt = datetime()
-        MERGE (sphere:Sphere {uri: $sphere_uri})
-        ON CREATE SET sphere.createdAt = datetime()
-        MERGE (target)-[r:IN_SPHERE {uri: $uri}]->(sphere)
-        ON CREATE SET r.cid = $cid,
-                      r.createdAt = $createdAt,
-                      r.updatedAt = datetime()
-        ON MATCH SET r.cid = $cid,
-                     r.updatedAt = datetime()
-        """
-
-        with self.driver.session() as session:
-            session.run(
-                query,
-                uri=uri,
-                cid=cid,
-                target_uri=target_uri,
-                sphere_uri=sphere_uri,
-                createdAt=value.get("createdAt", ""),
-            )
+        return {
+            "uri": uri,
+            "cid": cid,
+            "target_uri": target_uri,
+            "sphere_uri": value.get("sphere_uri", ""),
+            "createdAt": value.get("createdAt", ""),
+        }
 
     def get_concept_network(self, concept_text: str, depth: int = 2) -> Dict:
         """
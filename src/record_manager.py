@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from atproto import Client as AtProtoClient
 from datetime import datetime
 import time
@@ -317,21 +317,19 @@ class RecordManager:
             logger.error(f"Error listing records in collection {collection}: {str(e)}")
             raise e
 
-    def list_all_records(self, collection: str) -> List[Dict]:
+    def iter_records(self, collection: str) -> Iterator[Dict]:
         """
-        List ALL records in a collection, handling pagination automatically.
+        Iterate over ALL records in a collection, fetching one page at a time.
 
         Args:
             collection: The collection to list records from (e.g., me.cominds.thought)
 
-        Returns:
-            A list of all record dictionaries in the collection
+        Yields:
+            Record dictionaries, in the order the API returns them
 
         Raises:
             Exception: If the API request fails
         """
-        logger.info(f"Listing all records in collection: {collection}")
-        all_records = []
         cursor = None
 
         try:
@@ -346,7 +344,7 @@ class RecordManager:
                     params['cursor'] = cursor
 
                 response = self.client.com.atproto.repo.list_records(params)
-                all_records.extend(response.records)
+                yield from response.records
 
                 # Check if there are more records
                 if hasattr(response, 'cursor') and response.cursor:
@@ -354,13 +352,28 @@ class RecordManager:
                     logger.debug(f"Found {len(response.records)} records, continuing with cursor: {cursor}")
                 else:
                     break
-
-            logger.info(f"Found {len(all_records)} total records in collection: {collection}")
-            return all_records
         except Exception as e:
             logger.error(f"Error listing all records in collection {collection}: {str(e)}")
             raise e
 
+    def list_all_records(self, collection: str) -> List[Dict]:
+        """
+        List ALL records in a collection, handling pagination automatically.
+
+        Args:
+            collection: The collection to list records from (e.g., me.cominds.thought)
+
+        Returns:
+            A list of all record dictionaries in the collection
+
+        Raises:
+            Exception: If the API request fails
+        """
+        logger.info(f"Listing all records in collection: {collection}")
+        all_records = list(self.iter_records(collection))
+        logger.info(f"Found {len(all_records)} total records in collection: {collection}")
+        return all_records
+
     def delete_record(self, collection: str, rkey: str, sleep_time: int = 1) -> None:
         """
         Delete a record from the user's repository.
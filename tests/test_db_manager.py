@@ -0,0 +1,625 @@
+import pytest
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Add the parent directory to the path so we can import our module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+kuzu = pytest.importorskip("kuzu")
+
+import src.db_manager as db_manager_module
+from src.db_manager import READ_POOL_SIZE, DBManager, mirror_records_to_db
+
+AUTHOR_DID = "did:plc:testauthor"
+CONCEPT_COLLECTION = "me.comind.blip.concept"
+
+
+def concept_uri(rkey: str) -> str:
+    return f"at://{AUTHOR_DID}/{CONCEPT_COLLECTION}/{rkey}"
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Fresh DBManager with the schema and a single author."""
+    manager = DBManager(str(tmp_path / "db"))
+    manager.setup_schema()
+    manager.store_user(AUTHOR_DID, "author.test", "Test Author")
+    return manager
+
+
+def store_concept(db_manager, rkey: str, text: str):
+    db_manager.store_record(
+        collection=CONCEPT_COLLECTION,
+        record={"text": text, "createdAt": "2025-01-01T00:00:00Z"},
+        uri=concept_uri(rkey),
+        cid="",
+        author_did=AUTHOR_DID,
+        rkey=rkey,
+    )
+
+
+def link(db_manager, source: str, target: str, rel_type: str):
+    db_manager.conn.execute("""
+        MATCH (s:Record {uri: $source}), (t:Record {uri: $target})
+        CREATE (s)-[:LINKS {relType: $rel_type, strength: 1.0, note: '', createdAt: timestamp('2025-01-01')}]->(t)
+    """, {'source': concept_uri(source), 'target': concept_uri(target), 'rel_type': rel_type})
+
+
+def test_get_record_by_uri_caches_misses(db_manager):
+    """Test that a missing URI is remembered and not queried again."""
+    uri = concept_uri("missing")
+
+    assert db_manager.get_record_by_uri(uri) is None
+    assert uri in db_manager._missing
+
+
+def test_store_record_invalidates_cached_miss(db_manager):
+    """Test that storing a record clears a previously cached miss."""
+    assert db_manager.get_record_by_uri(concept_uri("a")) is None
+
+    store_concept(db_manager, "a", "hello world")
+
+    assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "hello world"
+
+
+def test_store_record_invalidates_cached_content(db_manager):
+    """Test that a cached record is refreshed when the record is stored again."""
+    store_concept(db_manager, "a", "hello world")
+    assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "hello world"
+
+    store_concept(db_manager, "a", "goodbye world")
+
+    assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "goodbye world"
+
+
+def test_record_exists(db_manager):
+    """Test that record_exists reports stored and missing records."""
+    store_concept(db_manager, "a", "hello world")
+
+    assert db_manager.record_exists(concept_uri("a"))
+    assert not db_manager.record_exists(concept_uri("missing"))
+    assert concept_uri("missing") in db_manager._missing
+
+
+def test_clear_collection_removes_records_and_typed_nodes(db_manager):
+    """Test that clearing a collection drops base records, typed nodes and edges."""
+    for i in range(3):
+        store_concept(db_manager, str(i), f"concept {i}")
+
+    assert db_manager.clear_collection(CONCEPT_COLLECTION) == 3
+    assert db_manager.list_records(CONCEPT_COLLECTION) == []
+
+    result = db_manager.conn.execute("MATCH (c:BlipConcept) RETURN count(c)")
+    assert result.get_next()[0] == 0
+    result = db_manager.conn.execute("MATCH ()-[a:AUTHORED]->() RETURN count(a)")
+    assert result.get_next()[0] == 0
+
+
+def test_clear_collection_of_unknown_collection_returns_zero(db_manager):
+    """Test that clearing a collection with no records deletes nothing."""
+    store_concept(db_manager, "a", "hello")
+
+    assert db_manager.clear_collection("me.comind.blip.emotion") == 0
+    assert len(db_manager.list_records(CONCEPT_COLLECTION)) == 1
+
+
+@pytest.mark.parametrize("arrow", [True, False], ids=["arrow", "rows"])
+def test_iter_records_converts_result_in_batches(db_manager, monkeypatch, arrow):
+    """Test that converting the result a few rows at a time yields every record exactly once."""
+    # Cover both ways _iter_rows reads a result, whichever is installed
+    monkeypatch.setattr(db_manager_module, "pyarrow", pytest.importorskip("pyarrow") if arrow else None)
+    for i in range(5):
+        store_concept(db_manager, str(i), f"concept {i}")
+
+    records = list(db_manager.iter_records(CONCEPT_COLLECTION, batch_size=2))
+
+    assert [record["uri"] for record in records] == [concept_uri(str(i)) for i in range(5)]
+    assert records[4]["value"]["text"] == "concept 4"
+
+
+def test_delete_record_removes_record_and_its_relationships(db_manager):
+    """Test that deleting a linked record drops its edges but not its neighbours."""
+    for rkey in "ab":
+        store_concept(db_manager, rkey, rkey)
+    link(db_manager, "a", "b", "supports")
+
+    assert db_manager.delete_record(CONCEPT_COLLECTION, "a") is True
+
+    assert db_manager.get_record_by_uri(concept_uri("a")) is None
+    assert [record["uri"] for record in db_manager.list_records(CONCEPT_COLLECTION)] == [concept_uri("b")]
+    assert db_manager.delete_record(CONCEPT_COLLECTION, "a") is False
+
+
+def test_find_records_basic_matches_case_insensitively(db_manager):
+    """Test that the fallback search matches stored content regardless of case."""
+    store_concept(db_manager, "a", "Distributed Systems")
+    store_concept(db_manager, "b", "Graph databases")
+
+    matches = db_manager._find_records_basic("distributed", CONCEPT_COLLECTION)
+
+    assert [match["uri"] for match in matches] == [concept_uri("a")]
+    assert matches[0]["value"]["text"] == "Distributed Systems"
+
+
+def test_store_records_bulk_creates_nodes_and_relationships(db_manager):
+    """Test that bulk storage writes records, typed nodes and relationships."""
+    sphere_uri = f"at://{AUTHOR_DID}/me.comind.sphere.core/s"
+    link_uri = f"at://{AUTHOR_DID}/me.comind.relationship.link/l"
+    created_at = "2025-01-01T00:00:00Z"
+    records = [
+        {
+            'collection': "me.comind.sphere.core",
+            'record': {"title": "Sphere", "text": "about", "createdAt": created_at},
+            'uri': sphere_uri,
+            'cid': "",
+            'author_did': AUTHOR_DID,
+        },
+        {
+            'collection': CONCEPT_COLLECTION,
+            'record': {"text": "hello", "createdAt": created_at},
+            'uri': concept_uri("a"),
+            'cid': "",
+            'author_did': AUTHOR_DID,
+            'rkey': "a",
+            'sphere_uri': sphere_uri,
+        },
+        {
+            'collection': "me.comind.relationship.link",
+            'record': {
+                "relationship": "references",
+                "target": concept_uri("a"),
+                "strength": 0.5,
+                "createdAt": created_at,
+            },
+            'uri': link_uri,
+            'cid': "",
+            'author_did': AUTHOR_DID,
+            'rkey': "l",
+        },
+    ]
+
+    db_manager.store_records_bulk(records)
+
+    assert db_manager.get_record(CONCEPT_COLLECTION, "a")["text"] == "hello"
+    assert [record["uri"] for record in db_manager.list_records(CONCEPT_COLLECTION)] == [
+        concept_uri("a")
+    ]
+    assert db_manager.get_record("me.comind.relationship.link", "l")["strength"] == 0.5
+
+    result = db_manager.conn.execute("MATCH ()-[a:AUTHORED]->() RETURN count(a)")
+    assert result.get_next()[0] == 3
+    result = db_manager.conn.execute("MATCH (:Record)-[s:IN_SPHERE]->(:Sphere) RETURN count(s)")
+    assert result.get_next()[0] == 1
+
+    relationships = db_manager.query_relationships(link_uri)
+    assert [rel["target_uri"] for rel in relationships] == [concept_uri("a")]
+    assert relationships[0]["relationship"]["strength"] == 0.5
+
+
+def test_setup_schema_links_existing_records_to_collections(db_manager):
+    """Test that the collection index is backfilled for databases created before it."""
+    store_concept(db_manager, "a", "hello")
+    db_manager.conn.execute("DROP TABLE IN_COLLECTION")
+    db_manager.conn.execute("DROP TABLE Collection")
+
+    db_manager.setup_schema()
+
+    assert [record["uri"] for record in db_manager.list_records(CONCEPT_COLLECTION)] == [
+        concept_uri("a")
+    ]
+
+
+def test_setup_schema_backfills_lowercase_content(db_manager):
+    """Test that records stored before content_lc existed are still searchable."""
+    store_concept(db_manager, "a", "Distributed Systems")
+    db_manager.conn.execute("ALTER TABLE Record DROP content_lc")
+
+    db_manager.setup_schema()
+
+    matches = db_manager._find_records_basic("distributed", CONCEPT_COLLECTION)
+    assert [match["uri"] for match in matches] == [concept_uri("a")]
+
+
+def test_find_similar_records_falls_back_without_fts(db_manager):
+    """Test that search uses the basic match when FTS is unavailable."""
+    store_concept(db_manager, "a", "Distributed Systems")
+    db_manager._fts_available = False
+
+    matches = db_manager.find_similar_records("distributed", CONCEPT_COLLECTION)
+
+    assert [match["uri"] for match in matches] == [concept_uri("a")]
+
+
+@pytest.mark.parametrize("error, disabled", [
+    ("Catalog exception: function QUERY_FTS_INDEX is not defined.", True),
+    ("Binder exception: Table Record doesn't have an index with name content_index.", True),
+    ("Interrupted.", False),
+])
+def test_find_similar_records_disables_only_missing_fts(db_manager, monkeypatch, error, disabled):
+    """Test that an FTS failure falls back to basic search, disabling FTS only if it is missing."""
+    store_concept(db_manager, "a", "Distributed Systems")
+    db_manager._fts_available = True
+
+    def failing_fts(*args, **kwargs):
+        raise RuntimeError(error)
+
+    monkeypatch.setattr(db_manager, "_find_records_fts", failing_fts)
+
+    matches = db_manager.find_similar_records("distributed", CONCEPT_COLLECTION)
+
+    assert [match["uri"] for match in matches] == [concept_uri("a")]
+    assert db_manager._fts_available is not disabled
+
+
+def test_find_similar_records_passes_only_words_to_fts(db_manager, monkeypatch):
+    """Test that FTS gets the words of the search text and wordless text skips it."""
+    store_concept(db_manager, "a", "Distributed Systems")
+    db_manager._fts_available = True
+    fts_queries = []
+
+    def recording_fts(text, *args, **kwargs):
+        fts_queries.append(text)
+        return []
+
+    monkeypatch.setattr(db_manager, "_find_records_fts", recording_fts)
+
+    db_manager.find_similar_records("distributed (systems)?! " + "x" * 100, CONCEPT_COLLECTION)
+    matches = db_manager.find_similar_records("--", CONCEPT_COLLECTION)
+
+    assert fts_queries == ["distributed systems"]
+    assert matches == []
+
+
+def test_find_similar_uris_skips_content(db_manager):
+    """Test that URI-only search returns matches without their content."""
+    store_concept(db_manager, "a", "Distributed Systems")
+
+    matches = db_manager.find_similar_uris("distributed", CONCEPT_COLLECTION)
+
+    assert [match["uri"] for match in matches] == [concept_uri("a")]
+    assert "value" not in matches[0]
+
+
+def test_find_records_fts_retries_without_top(db_manager, monkeypatch):
+    """Test that an FTS extension rejecting TOP gets the query without it."""
+    store_concept(db_manager, "a", "Distributed Systems")
+    queries = []
+
+    class FakeConn:
+        def execute(self, query, params):
+            queries.append(query)
+            if "TOP :=" in query:
+                raise RuntimeError("Binder exception: Unrecognized optional parameter: TOP")
+            return db_manager.conn.execute(f"RETURN '{concept_uri('a')}', 'concept', 1.0")
+
+    @contextmanager
+    def fake_read_conn():
+        yield FakeConn()
+
+    monkeypatch.setattr(db_manager, "_read_conn", fake_read_conn)
+
+    for _ in range(2):
+        matches = db_manager._find_records_fts("distributed", include_content=False)
+        assert [match["uri"] for match in matches] == [concept_uri("a")]
+
+    assert ["TOP :=" in query for query in queries] == [True, False, False]
+
+
+def test_mirror_records_to_db_uses_given_did(db_manager):
+    """Test that mirroring with an explicit DID doesn't need a record manager."""
+    records = [({"text": f"concept {i}", "createdAt": "2025-01-01T00:00:00Z"}, str(i)) for i in range(3)]
+
+    uris = mirror_records_to_db(None, db_manager, CONCEPT_COLLECTION, records, did=AUTHOR_DID)
+
+    assert uris == [concept_uri(str(i)) for i in range(3)]
+    assert db_manager.get_record_by_uri(concept_uri("2"))["text"] == "concept 2"
+
+
+def test_store_records_bulk_keeps_last_record_of_repeated_uri(db_manager):
+    """Test that a batch repeating a URI stores it once, with its last record."""
+    records = [({"text": text, "createdAt": "2025-01-01T00:00:00Z"}, "a") for text in ("v1", "v2")]
+    records.append(({"text": "other", "createdAt": "2025-01-01T00:00:00Z"}, "b"))
+
+    mirror_records_to_db(None, db_manager, CONCEPT_COLLECTION, records, did=AUTHOR_DID)
+
+    assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "v2"
+    assert len(db_manager.list_records(CONCEPT_COLLECTION)) == 2
+
+
+def test_concurrent_searches_share_the_read_pool(db_manager):
+    """Test that more concurrent searches than pooled connections all complete."""
+    store_concept(db_manager, "a", "Distributed Systems")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda _: db_manager.find_similar_uris("distributed", CONCEPT_COLLECTION),
+            range(32),
+        ))
+
+    assert all([match["uri"] for match in matches] == [concept_uri("a")] for matches in results)
+    assert db_manager._read_pool.qsize() == READ_POOL_SIZE
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    """Test that creating a manager doesn't open or create its database."""
+    manager = DBManager(str(tmp_path / "lazy"))
+
+    assert not (tmp_path / "lazy").exists()
+
+    manager.setup_schema()
+
+    assert manager.get_record_by_uri(concept_uri("a")) is None
+
+
+def test_setup_schema_sets_up_fts_once(tmp_path, monkeypatch):
+    """Test that setting up the schema tries to set up an unavailable FTS index only once."""
+    manager = DBManager(str(tmp_path / "db"))
+    calls = []
+
+    def failing_setup_fts_index():
+        calls.append(1)
+        return False
+
+    monkeypatch.setattr(manager, "setup_fts_index", failing_setup_fts_index)
+
+    manager.setup_schema()
+    assert len(calls) == 1
+    assert manager._fts_available is False
+
+    manager.setup_schema()
+    assert len(calls) == 2
+
+
+def test_managers_on_the_same_path_share_a_database(db_manager):
+    """Test that a second manager reuses the open database and sees its writes."""
+    store_concept(db_manager, "a", "hello world")
+
+    other = DBManager(db_manager.db_path)
+
+    assert other.db is db_manager.db
+    assert other._read_pool is db_manager._read_pool
+    assert other.get_record_by_uri(concept_uri("a"))["text"] == "hello world"
+
+
+def test_cached_miss_is_invalidated_by_another_manager(db_manager):
+    """Test that a record stored through one manager isn't hidden by another's cached miss."""
+    other = DBManager(db_manager.db_path)
+    assert not db_manager.record_exists(concept_uri("a"))
+
+    store_concept(other, "a", "hello world")
+
+    assert db_manager.record_exists(concept_uri("a"))
+
+
+def test_cached_content_is_invalidated_by_another_manager(db_manager):
+    """Test that a record rewritten or deleted through one manager isn't read stale from another."""
+    other = DBManager(db_manager.db_path)
+    store_concept(db_manager, "a", "hello world")
+    assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "hello world"
+
+    store_concept(other, "a", "goodbye world")
+    assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "goodbye world"
+
+    other.delete_record(CONCEPT_COLLECTION, "a")
+    assert db_manager.get_record_by_uri(concept_uri("a")) is None
+
+
+def test_lookups_in_a_transaction_are_not_shared(db_manager):
+    """Test that another manager doesn't read a transaction's uncommitted writes from the caches."""
+    other = DBManager(db_manager.db_path)
+    store_concept(db_manager, "b", "committed")
+
+    with pytest.raises(RuntimeError, match="rolled back"):
+        with db_manager.transaction():
+            store_concept(db_manager, "a", "uncommitted")
+            assert db_manager.get_record_by_uri(concept_uri("a"))["text"] == "uncommitted"
+            db_manager.delete_record(CONCEPT_COLLECTION, "b")
+            assert not db_manager.record_exists(concept_uri("b"))
+
+            assert other.get_record_by_uri(concept_uri("a")) is None
+            assert other.record_exists(concept_uri("b"))
+            raise RuntimeError("rolled back")
+
+    assert other.get_record_by_uri(concept_uri("a")) is None
+    assert other.get_record_by_uri(concept_uri("b"))["text"] == "committed"
+
+
+def test_setup_schema_completes_partial_schema(db_manager):
+    """Test that tables missing from a partially created schema are still created."""
+    db_manager.conn.execute("DROP TABLE TARGET")
+
+    db_manager.setup_schema()
+
+    result = db_manager.conn.execute("MATCH ()-[t:TARGET]->() RETURN count(t)")
+    assert result.get_next()[0] == 0
+
+
+def test_store_records_bulk_single_record_with_strong_ref_target(db_manager):
+    """Test that a lone bulk record resolves a strong reference target."""
+    link_uri = f"at://{AUTHOR_DID}/me.comind.relationship.link/l"
+    store_concept(db_manager, "a", "hello")
+
+    db_manager.store_records_bulk([{
+        'collection': "me.comind.relationship.link",
+        'record': {
+            "relationship": "references",
+            "target": {"uri": concept_uri("a"), "cid": ""},
+            "createdAt": "2025-01-01T00:00:00Z",
+        },
+        'uri': link_uri,
+        'cid': "",
+        'author_did': AUTHOR_DID,
+        'rkey': "l",
+    }])
+
+    relationships = db_manager.query_relationships(link_uri)
+    assert [rel["target_uri"] for rel in relationships] == [concept_uri("a")]
+
+
+def test_store_records_bulk_defaults_null_fields(db_manager):
+    """Test that fields null in every row of a batch are stored with their defaults."""
+    emotion_uri = f"at://{AUTHOR_DID}/me.comind.blip.emotion/e"
+    links = [f"at://{AUTHOR_DID}/me.comind.relationship.link/{rkey}" for rkey in "lm"]
+    store_concept(db_manager, "a", "hello")
+    records = [{
+        'collection': "me.comind.blip.emotion",
+        'record': {"type": None, "text": "joy", "createdAt": "2025-01-01T00:00:00Z"},
+        'uri': emotion_uri,
+        'cid': "",
+        'author_did': AUTHOR_DID,
+    }]
+    records.extend({
+        'collection': "me.comind.relationship.link",
+        'record': {
+            "relationship": "references",
+            "target": concept_uri("a"),
+            "strength": None,
+            "note": None,
+            "createdAt": "2025-01-01T00:00:00Z",
+        },
+        'uri': uri,
+        'cid': "",
+        'author_did': AUTHOR_DID,
+    } for uri in links)
+
+    db_manager.store_records_bulk(records)
+
+    result = db_manager.conn.execute("MATCH (e:BlipEmotion) RETURN e.type")
+    assert result.get_next()[0] == ""
+    relationships = db_manager.query_relationships(links[0])
+    assert relationships[0]["relationship"]["strength"] == 1.0
+    assert relationships[0]["relationship"]["note"] == ""
+
+
+def test_bulk_load_commits_writes(db_manager):
+    """Test that writes made in a bulk load, including nested ones, are committed."""
+    with db_manager.bulk_load():
+        store_concept(db_manager, "a", "hello")
+        with db_manager.bulk_load():
+            store_concept(db_manager, "b", "world")
+
+    assert len(db_manager.list_records(CONCEPT_COLLECTION)) == 2
+    assert [match["uri"] for match in db_manager.find_similar_uris("world")] == [concept_uri("b")]
+
+
+def test_bulk_load_rolls_back_on_error(db_manager):
+    """Test that a failed bulk load leaves no partial writes behind."""
+    with pytest.raises(ValueError):
+        with db_manager.bulk_load():
+            store_concept(db_manager, "a", "hello")
+            raise ValueError("ingest failed")
+
+    assert db_manager.list_records(CONCEPT_COLLECTION) == []
+    store_concept(db_manager, "b", "world")
+    assert len(db_manager.list_records(CONCEPT_COLLECTION)) == 1
+
+
+def test_store_records_bulk_is_atomic(db_manager, monkeypatch):
+    """Test that a batch failing partway through stores none of its records."""
+    store_concept(db_manager, "a", "hello")
+    monkeypatch.setattr("src.db_manager._BULK_TARGET_QUERY", "MATCH (r:Missing) RETURN r")
+
+    with pytest.raises(RuntimeError, match="Table Missing does not exist"):
+        db_manager.store_records_bulk([
+            {"collection": CONCEPT_COLLECTION, "record": {"text": rkey, "target": concept_uri("a")},
+             "uri": concept_uri(rkey), "cid": "", "author_did": AUTHOR_DID, "rkey": rkey}
+            for rkey in "bc"
+        ])
+
+    assert db_manager.get_record_by_uri(concept_uri("b")) is None
+    assert db_manager.get_record_by_uri(concept_uri("c")) is None
+    store_concept(db_manager, "b", "world")
+    assert len(db_manager.list_records(CONCEPT_COLLECTION)) == 2
+
+
+def test_query_relationships_traverses_multiple_levels(db_manager):
+    """Test that deeper levels are expanded from every record reached at the previous one."""
+    for rkey in "abcd":
+        store_concept(db_manager, rkey, rkey)
+    link(db_manager, "a", "b", "supports")
+    link(db_manager, "a", "c", "contradicts")
+    link(db_manager, "b", "d", "supports")
+    link(db_manager, "c", "d", "supports")
+
+    hops = {
+        (rel["source_uri"], rel["target_uri"], rel["depth"])
+        for rel in db_manager.query_relationships(concept_uri("a"), max_depth=2)
+    }
+    assert hops == {
+        (concept_uri("a"), concept_uri("b"), 1),
+        (concept_uri("a"), concept_uri("c"), 1),
+        (concept_uri("b"), concept_uri("d"), 2),
+        (concept_uri("c"), concept_uri("d"), 2),
+    }
+
+    hops = {
+        (rel["source_uri"], rel["target_uri"], rel["depth"])
+        for rel in db_manager.query_relationships(concept_uri("a"), "supports", max_depth=2)
+    }
+    assert hops == {
+        (concept_uri("a"), concept_uri("b"), 1),
+        (concept_uri("b"), concept_uri("d"), 2),
+    }
+
+
+def test_query_relationships_does_not_expand_revisited_records(db_manager):
+    """Test that a record reached again deeper, e.g. around a cycle, isn't expanded again."""
+    for rkey in "abc":
+        store_concept(db_manager, rkey, rkey)
+    link(db_manager, "a", "b", "supports")
+    link(db_manager, "b", "a", "supports")
+    link(db_manager, "b", "c", "supports")
+
+    hops = [
+        (rel["source_uri"], rel["target_uri"], rel["depth"])
+        for rel in db_manager.query_relationships(concept_uri("a"), max_depth=4)
+    ]
+    assert sorted(hops) == [
+        (concept_uri("a"), concept_uri("b"), 1),
+        (concept_uri("b"), concept_uri("a"), 2),
+        (concept_uri("b"), concept_uri("c"), 2),
+    ]
+
+
+def test_records_by_unstored_authors_create_the_user(db_manager):
+    """Test that AUTHORED is linked even when the author wasn't stored first."""
+    other_did = "did:plc:otherauthor"
+    record = {"text": "hello", "createdAt": "2025-01-01T00:00:00Z"}
+    db_manager.store_record(CONCEPT_COLLECTION, record, f"at://{other_did}/{CONCEPT_COLLECTION}/a", "", other_did, "a")
+    db_manager.store_records_bulk([
+        {"collection": CONCEPT_COLLECTION, "record": record, "uri": f"at://{other_did}/{CONCEPT_COLLECTION}/{rkey}",
+         "cid": "", "author_did": other_did, "rkey": rkey}
+        for rkey in "bc"
+    ])
+    new_did = "did:plc:newauthor"
+    db_manager.store_records_bulk([
+        {"collection": CONCEPT_COLLECTION, "record": record, "uri": f"at://{new_did}/{CONCEPT_COLLECTION}/{rkey}",
+         "cid": "", "author_did": new_did, "rkey": rkey}
+        for rkey in "de"
+    ])
+
+    def authored_count(did):
+        result = db_manager.conn.execute(
+            "MATCH (:User {did: $did})-[:AUTHORED]->(r:Record) RETURN count(r)", {"did": did}
+        )
+        return result.get_next()[0]
+
+    assert authored_count(other_did) == 3
+    assert authored_count(new_did) == 2
+
+
+def test_query_relationships_can_skip_target_content(db_manager):
+    """Test that target content is only decoded when asked for."""
+    for rkey in "ab":
+        store_concept(db_manager, rkey, rkey)
+    link(db_manager, "a", "b", "supports")
+
+    [with_content] = db_manager.query_relationships(concept_uri("a"))
+    [without_content] = db_manager.query_relationships(concept_uri("a"), include_content=False)
+
+    assert with_content["target_data"]["text"] == "b"
+    assert "target_data" not in without_content
+    assert without_content["target_uri"] == concept_uri("b")
+    assert without_content["relationship"]["type"] == "supports"
@@ -0,0 +1,63 @@
+import pytest
+import os
+import sys
+
+# Add the parent directory to the path so we can import our module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+kuzu = pytest.importorskip("kuzu")
+atproto = pytest.importorskip("atproto")
+
+from src.db_manager import DBManager
+from src.db_tools import create_relationships_bulk
+
+AUTHOR_DID = "did:plc:testauthor"
+CONCEPT_COLLECTION = "me.comind.blip.concept"
+LINK_COLLECTION = "me.comind.relationship.link"
+
+
+def concept_uri(rkey: str) -> str:
+    return f"at://{AUTHOR_DID}/{CONCEPT_COLLECTION}/{rkey}"
+
+
+def link_uri(rkey: str) -> str:
+    return f"at://{AUTHOR_DID}/{LINK_COLLECTION}/{rkey}"
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Fresh DBManager with the schema, a single author and concepts a, b and c."""
+    manager = DBManager(str(tmp_path / "db"))
+    manager.setup_schema()
+    manager.store_user(AUTHOR_DID, "author.test", "Test Author")
+    for rkey in "abc":
+        manager.store_record(
+            collection=CONCEPT_COLLECTION,
+            record={"text": rkey, "createdAt": "2025-01-01T00:00:00Z"},
+            uri=concept_uri(rkey),
+            cid="",
+            author_did=AUTHOR_DID,
+            rkey=rkey,
+        )
+    return manager
+
+
+def test_create_relationships_bulk_skips_missing_records_and_repeats(db_manager):
+    """Test that bulk relationships are stored once each, skipping unknown endpoints."""
+    relationships = [
+        {"from_uri": concept_uri("a"), "to_uri": concept_uri("b"), "rel_type": "supports"},
+        {"from_uri": concept_uri("a"), "to_uri": concept_uri("c"), "rel_type": "refutes"},
+        {"from_uri": concept_uri("a"), "to_uri": concept_uri("missing"), "rel_type": "supports"},
+        {"from_uri": concept_uri("a"), "to_uri": concept_uri("b"), "rel_type": "extends",
+         "strength": 0.5, "note": "again"},
+    ]
+
+    assert create_relationships_bulk(db_manager, relationships) == 2
+
+    links = [record["uri"] for record in db_manager.list_records(LINK_COLLECTION)]
+    assert sorted(links) == [link_uri("a-b"), link_uri("a-c")]
+
+    relationships = db_manager.query_relationships(link_uri("a-b"))
+    assert [rel["target_uri"] for rel in relationships] == [concept_uri("b")]
+    assert relationships[0]["relationship"]["type"] == "extends"
+    assert relationships[0]["relationship"]["strength"] == 0.5
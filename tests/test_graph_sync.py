@@ -0,0 +1,92 @@
+import pytest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path so we can import our module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+neo4j = pytest.importorskip("neo4j")
+
+from src import graph_sync
+
+AUTHOR_DID = "did:plc:testauthor"
+CONCEPT_COLLECTION = "me.comind.concept"
+
+
+def concept_record(rkey: str, text: str):
+    return SimpleNamespace(
+        uri=f"at://{AUTHOR_DID}/{CONCEPT_COLLECTION}/{rkey}",
+        cid=f"cid-{rkey}",
+        value={"concept": text, "createdAt": "2025-01-01T00:00:00Z"},
+    )
+
+
+class FakeSession:
+    """A session that records each batch written and rejects any containing a bad row."""
+
+    def __init__(self, bad_uris=(), error=neo4j.exceptions.ClientError):
+        self.bad_uris = set(bad_uris)
+        self.error = error
+        self.batches = []
+
+    def execute_write(self, work, query, params):
+        rows = [row for group in params["groups"] for row in group["rows"]]
+        self.batches.append([row["uri"] for row in rows])
+        if any(row["uri"] in self.bad_uris for row in rows):
+            raise self.error("bad row")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(graph_sync, "GraphDatabase", MagicMock())
+    return graph_sync.GraphSyncService("bolt://localhost:7687", "neo4j", "password")
+
+
+def test_sync_records_writes_one_query_per_batch(service, monkeypatch):
+    """Test that records are written SYNC_BATCH_SIZE at a time."""
+    monkeypatch.setattr(graph_sync, "SYNC_BATCH_SIZE", 2)
+    session = FakeSession()
+    records = [concept_record(str(i), f"concept {i}") for i in range(5)]
+
+    assert service._sync_records(records, CONCEPT_COLLECTION, session) == 5
+    assert [len(batch) for batch in session.batches] == [2, 2, 1]
+
+
+def test_flush_batch_retries_rows_of_a_failed_batch(service):
+    """Test that one bad row doesn't drop the rest of its batch."""
+    records = [concept_record(str(i), f"concept {i}") for i in range(3)]
+    rows = [service._record_row(record, CONCEPT_COLLECTION) for record in records]
+    session = FakeSession(bad_uris={records[1].uri})
+
+    assert service._flush_batch(CONCEPT_COLLECTION, rows, session) == 2
+    assert session.batches == [
+        [record.uri for record in records],
+        [records[0].uri],
+        [records[1].uri],
+        [records[2].uri],
+    ]
+
+
+def test_flush_batch_raises_errors_the_driver_retries(service):
+    """Test that an unavailable server fails the batch without retrying its rows."""
+    records = [concept_record(str(i), f"concept {i}") for i in range(3)]
+    rows = [service._record_row(record, CONCEPT_COLLECTION) for record in records]
+    session = FakeSession(bad_uris={records[1].uri}, error=neo4j.exceptions.ServiceUnavailable)
+
+    with pytest.raises(neo4j.exceptions.ServiceUnavailable):
+        service._flush_batch(CONCEPT_COLLECTION, rows, session)
+    assert len(session.batches) == 1
+
+
+def test_prefetch_concept_texts_caches_concepts_without_text(service):
+    """Test that a concept record without text is cached as None without stopping the prefetch."""
+    records = [concept_record("a", "alpha"), concept_record("b", "beta")]
+    del records[0].value["concept"]
+    service.record_manager = SimpleNamespace(iter_records=lambda collection: iter(records))
+
+    service._prefetch_concept_texts()
+
+    assert service._fetch_concept_text(records[0].uri) is None
+    assert service._fetch_concept_text(records[1].uri) == "beta"